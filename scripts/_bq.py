@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Shared BigQuery client helper for the scripts in this directory.
+"""
+
+import os
+from functools import lru_cache
+from pathlib import Path
+
+from google.cloud import bigquery
+from google.oauth2 import service_account
+
+# Configuration
+PROJECT_ID = os.getenv("GCP_PROJECT_ID", "test-imagine-web")
+
+project_root = Path(__file__).parent.parent
+
+@lru_cache(maxsize=None)
+def get_client(project=PROJECT_ID):
+    """Return a process-wide cached BigQuery client per project.
+
+    The credentials file is read and the OAuth token exchange performed
+    once per process; scripts that chain several steps reuse the same
+    client and its keep-alive HTTP session instead of re-authenticating.
+    """
+    credentials_path = project_root / "Credentials" / "serviceAccountKey.json"
+
+    if credentials_path.exists():
+        credentials = service_account.Credentials.from_service_account_file(
+            str(credentials_path),
+            scopes=["https://www.googleapis.com/auth/bigquery"]
+        )
+        return bigquery.Client(credentials=credentials, project=project)
+    else:
+        return bigquery.Client(project=project)
@@ -1,448 +1,298 @@
-#!/usr/bin/env python3
-"""
-Import EOBI data from CSV file and update Employees table with EOBI numbers and missing data.
-
-Usage:
-    python scripts/import_eobi_data.py <csv_file_path>
-"""
-
-import csv
-import sys
-import os
-from datetime import datetime
-from google.cloud import bigquery
-from google.oauth2 import service_account
-
-# Add parent directory to path to import config
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-# Configuration - Update these based on your setup
-PROJECT_ID = os.getenv("GCP_PROJECT_ID", "test-imagine-web")
-DATASET_ID = os.getenv("BQ_DATASET", "Vyro_Business_Paradox")
-EMPLOYEES_TABLE = os.getenv("BQ_TABLE", "Employees")
-EOBI_TABLE = os.getenv("BQ_EOBI_TABLE", "Employee_EOBI")
-CREDENTIALS_PATH = os.getenv("GOOGLE_APPLICATION_CREDENTIALS", "Credentials/test-imagine-web-18d4f9a43aef.json")
-
-def get_bigquery_client():
-    """Initialize BigQuery client."""
-    credentials = service_account.Credentials.from_service_account_file(CREDENTIALS_PATH)
-    return bigquery.Client(credentials=credentials, project=PROJECT_ID)
-
-def parse_eobi_date(date_str):
-    """Parse EOBI date format (DD-MMM-YY) to YYYY-MM-DD."""
-    if not date_str or date_str.strip() == "":
-        return None
-    try:
-        # Handle formats like "12-Apr-04", "1-November-25"
-        date_str = date_str.strip()
-        parts = date_str.split("-")
-        if len(parts) == 3:
-            day = parts[0]
-            month_str = parts[1]
-            year_str = parts[2]
-            
-            # Map month names
-            month_map = {
-                "jan": 1, "january": 1,
-                "feb": 2, "february": 2,
-                "mar": 3, "march": 3,
-                "apr": 4, "april": 4,
-                "may": 5,
-                "jun": 6, "june": 6,
-                "jul": 7, "july": 7,
-                "aug": 8, "august": 8,
-                "sep": 9, "september": 9,
-                "oct": 10, "october": 10,
-                "nov": 11, "november": 11,
-                "dec": 12, "december": 12
-            }
-            
-            month = month_map.get(month_str.lower(), None)
-            if not month:
-                return None
-            
-            # Handle 2-digit year (assume 2000s for years < 50, 1900s for years >= 50)
-            year = int(year_str)
-            if year < 50:
-                year = 2000 + year
-            else:
-                year = 1900 + year
-            
-            return f"{year}-{month:02d}-{int(day):02d}"
-    except Exception as e:
-        print(f"Error parsing date '{date_str}': {e}")
-        return None
-    return None
-
-def read_eobi_csv(file_path):
-    """Read EOBI CSV file and return list of records."""
-    records = []
-    with open(file_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            # Clean up column names (remove extra spaces and parentheses)
-            cleaned_row = {}
-            for key, value in row.items():
-                # Remove parenthetical descriptions from headers
-                clean_key = key.split('(')[0].strip()
-                cleaned_row[clean_key] = value.strip() if value else ""
-            
-            records.append(cleaned_row)
-    return records
-
-def match_employee(client, name, cnic):
-    """Find employee in BigQuery by name or CNIC."""
-    table_ref = f"{PROJECT_ID}.{DATASET_ID}.{EMPLOYEES_TABLE}"
-    
-    # Try matching by CNIC first (more reliable)
-    if cnic:
-        query = f"""
-        SELECT Employee_ID, Full_Name, CNIC_ID
-        FROM `{table_ref}`
-        WHERE CNIC_ID = @cnic
-        LIMIT 1
-        """
-        job_config = bigquery.QueryJobConfig(
-            query_parameters=[
-                bigquery.ScalarQueryParameter("cnic", "STRING", cnic)
-            ]
-        )
-        results = client.query(query, job_config=job_config).result()
-        for row in results:
-            return row.Employee_ID, row.Full_Name
-    
-    # Fallback to name matching
-    if name:
-        query = f"""
-        SELECT Employee_ID, Full_Name, CNIC_ID
-        FROM `{table_ref}`
-        WHERE LOWER(TRIM(Full_Name)) = LOWER(TRIM(@name))
-        LIMIT 1
-        """
-        job_config = bigquery.QueryJobConfig(
-            query_parameters=[
-                bigquery.ScalarQueryParameter("name", "STRING", name)
-            ]
-        )
-        results = client.query(query, job_config=job_config).result()
-        for row in results:
-            return row.Employee_ID, row.Full_Name
-    
-    return None, None
-
-def extract_payroll_month(file_path):
-    """Extract payroll month from CSV filename.
-    
-    Examples:
-        "EOBI updated data- AI - To be uploaded November 2025 (1).csv" -> "2025-11-01"
-        "eobi-november-2025.csv" -> "2025-11-01"
-    """
-    import re
-    filename = os.path.basename(file_path)
-    
-    # Try to find month and year in filename
-    month_map = {
-        "january": 1, "jan": 1,
-        "february": 2, "feb": 2,
-        "march": 3, "mar": 3,
-        "april": 4, "apr": 4,
-        "may": 5,
-        "june": 6, "jun": 6,
-        "july": 7, "jul": 7,
-        "august": 8, "aug": 8,
-        "september": 9, "sep": 9,
-        "october": 10, "oct": 10,
-        "november": 11, "nov": 11,
-        "december": 12, "dec": 12
-    }
-    
-    # Look for pattern like "November 2025" or "Nov 2025"
-    pattern = r'(\w+)\s+(\d{4})'
-    match = re.search(pattern, filename, re.IGNORECASE)
-    
-    if match:
-        month_str = match.group(1).lower()
-        year = int(match.group(2))
-        month = month_map.get(month_str)
-        if month:
-            return f"{year}-{month:02d}-01"
-    
-    # Default to current month if not found
-    now = datetime.now()
-    return f"{now.year}-{now.month:02d}-01"
-
-def get_next_eobi_id(client):
-    """Get the next available EOBI_ID."""
-    eobi_table_ref = f"{PROJECT_ID}.{DATASET_ID}.{EOBI_TABLE}"
-    query = f"""
-    SELECT COALESCE(MAX(EOBI_ID), 0) + 1 AS next_id
-    FROM `{eobi_table_ref}`
-    """
-    results = client.query(query).result()
-    for row in results:
-        return row.next_id
-    return 1
-
-def check_eobi_record_exists(client, employee_id, payroll_month):
-    """Check if EOBI record already exists for this employee and month."""
-    eobi_table_ref = f"{PROJECT_ID}.{DATASET_ID}.{EOBI_TABLE}"
-    query = f"""
-    SELECT COUNT(1) as count
-    FROM `{eobi_table_ref}`
-    WHERE SAFE_CAST(Employee_ID AS INT64) = @employee_id
-      AND Payroll_Month = @payroll_month
-    """
-    job_config = bigquery.QueryJobConfig(
-        query_parameters=[
-            bigquery.ScalarQueryParameter("employee_id", "INT64", employee_id),
-            bigquery.ScalarQueryParameter("payroll_month", "DATE", payroll_month)
-        ]
-    )
-    results = client.query(query, job_config=job_config).result()
-    for row in results:
-        return row.count > 0
-    return False
-
-def insert_eobi_record(client, employee_id, eobi_data, payroll_month_date):
-    """Insert EOBI record into Employee_EOBI table.
-    
-    Args:
-        client: BigQuery client
-        employee_id: Employee ID (INT64)
-        eobi_data: Dictionary with EOBI fields from CSV
-        payroll_month_date: Date string in YYYY-MM-DD format (first day of month)
-    
-    Returns:
-        True if inserted, False if skipped (duplicate or error), or error message string
-    """
-    eobi_table_ref = f"{PROJECT_ID}.{DATASET_ID}.{EOBI_TABLE}"
-    
-    # Don't check for duplicates - let INSERT handle it
-    # This ensures we try to insert all records
-    
-    # Get next EOBI_ID
-    eobi_id = get_next_eobi_id(client)
-    
-    # Parse dates
-    dob = parse_eobi_date(eobi_data.get("DOB", ""))
-    doj = parse_eobi_date(eobi_data.get("DOJ", ""))
-    doe = parse_eobi_date(eobi_data.get("DOE", ""))
-    from_date = parse_eobi_date(eobi_data.get("From_Date", ""))
-    to_date = parse_eobi_date(eobi_data.get("To_Date", ""))
-    
-    # Parse numeric fields
-    try:
-        days_worked = float(eobi_data.get("NO_OF_DAYS_WORKED", "0") or "0")
-    except:
-        days_worked = 0
-    
-    # Build insert query
-    query = f"""
-    INSERT INTO `{eobi_table_ref}` (
-        EOBI_ID,
-        Employee_ID,
-        Payroll_Month,
-        EMP_AREA_CODE,
-        EMP_REG_SERIAL_NO,
-        EMP_SUB_AREA_CODE,
-        EMP_SUB_SERIAL_NO,
-        EOBI_NO,
-        DOB,
-        DOJ,
-        DOE,
-        NO_OF_DAYS_WORKED,
-        From_Date,
-        To_Date,
-        Loaded_At,
-        Created_At
-    ) VALUES (
-        @eobi_id,
-        @employee_id,
-        @payroll_month,
-        @emp_area_code,
-        @emp_reg_serial_no,
-        @emp_sub_area_code,
-        @emp_sub_serial_no,
-        @eobi_no,
-        @dob,
-        @doj,
-        @doe,
-        @days_worked,
-        @from_date,
-        @to_date,
-        CURRENT_TIMESTAMP(),
-        CURRENT_TIMESTAMP()
-    )
-    """
-    
-    params = [
-        bigquery.ScalarQueryParameter("eobi_id", "INT64", eobi_id),
-        bigquery.ScalarQueryParameter("employee_id", "INT64", employee_id),
-        bigquery.ScalarQueryParameter("payroll_month", "DATE", payroll_month_date),
-        bigquery.ScalarQueryParameter("emp_area_code", "STRING", eobi_data.get("EMP_AREA_CODE", "FAA") or "FAA"),
-        bigquery.ScalarQueryParameter("emp_reg_serial_no", "STRING", eobi_data.get("EMP_REG_SERIAL_NO", "4320") or "4320"),
-        bigquery.ScalarQueryParameter("emp_sub_area_code", "STRING", eobi_data.get("EMP_SUB_AREA_CODE", " ") or " "),
-        bigquery.ScalarQueryParameter("emp_sub_serial_no", "STRING", eobi_data.get("EMP_SUB_SERIAL_NO", "0") or "0"),
-        bigquery.ScalarQueryParameter("eobi_no", "STRING", eobi_data.get("EOBI_NO", "") or ""),
-        bigquery.ScalarQueryParameter("dob", "DATE", dob if dob else None),
-        bigquery.ScalarQueryParameter("doj", "DATE", doj if doj else None),
-        bigquery.ScalarQueryParameter("doe", "DATE", doe if doe else None),
-        bigquery.ScalarQueryParameter("days_worked", "NUMERIC", days_worked),
-        bigquery.ScalarQueryParameter("from_date", "DATE", from_date if from_date else None),
-        bigquery.ScalarQueryParameter("to_date", "DATE", to_date if to_date else None),
-    ]
-    
-    job_config = bigquery.QueryJobConfig(query_parameters=params)
-    try:
-        query_job = client.query(query, job_config=job_config)
-        query_job.result()  # Wait for completion
-        return True
-    except Exception as e:
-        error_msg = str(e)
-        # Check if it's a duplicate error
-        if "duplicate" in error_msg.lower() or "already exists" in error_msg.lower():
-            return False  # Silent skip for duplicates
-        # Return error message for other errors
-        return error_msg
-
-def update_employee_eobi(client, employee_id, eobi_data):
-    """Update employee record with EOBI data."""
-    table_ref = f"{PROJECT_ID}.{DATASET_ID}.{EMPLOYEES_TABLE}"
-    
-    updates = []
-    params = []
-    
-    # EOBI Number
-    if eobi_data.get("EOBI_NO"):
-        updates.append("EOBI_Number = @eobi_no")
-        params.append(bigquery.ScalarQueryParameter("eobi_no", "STRING", eobi_data["EOBI_NO"]))
-    
-    # Date of Birth (if missing)
-    if eobi_data.get("DOB"):
-        dob = parse_eobi_date(eobi_data["DOB"])
-        if dob:
-            updates.append("Date_of_Birth = @dob")
-            params.append(bigquery.ScalarQueryParameter("dob", "DATE", dob))
-    
-    # Joining Date (if missing or to verify)
-    if eobi_data.get("DOJ"):
-        doj = parse_eobi_date(eobi_data["DOJ"])
-        if doj:
-            updates.append("Joining_Date = @doj")
-            params.append(bigquery.ScalarQueryParameter("doj", "DATE", doj))
-    
-    # CNIC (if missing)
-    if eobi_data.get("CNIC"):
-        updates.append("CNIC_ID = @cnic")
-        params.append(bigquery.ScalarQueryParameter("cnic", "STRING", eobi_data["CNIC"]))
-    
-    if not updates:
-        return False
-    
-    # Build update query
-    query = f"""
-    UPDATE `{table_ref}`
-    SET {', '.join(updates)}, Updated_At = CURRENT_DATETIME()
-    WHERE Employee_ID = @employee_id
-    """
-    
-    params.append(bigquery.ScalarQueryParameter("employee_id", "INT64", employee_id))
-    
-    job_config = bigquery.QueryJobConfig(query_parameters=params)
-    try:
-        query_job = client.query(query, job_config=job_config)
-        query_job.result()  # Wait for completion
-        return True
-    except Exception as e:
-        print(f"    ⚠ Error updating Employees table: {e}")
-        raise
-
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: python scripts/import_eobi_data.py <csv_file_path>")
-        sys.exit(1)
-    
-    csv_file = sys.argv[1]
-    
-    if not os.path.exists(csv_file):
-        print(f"Error: CSV file not found: {csv_file}")
-        sys.exit(1)
-    
-    print(f"Reading EOBI data from: {csv_file}")
-    eobi_records = read_eobi_csv(csv_file)
-    print(f"Found {len(eobi_records)} records in CSV")
-    
-    # Extract payroll month from filename
-    payroll_month = extract_payroll_month(csv_file)
-    print(f"Detected Payroll Month: {payroll_month}")
-    
-    client = get_bigquery_client()
-    
-    matched = 0
-    updated = 0
-    inserted = 0
-    skipped_duplicates = 0
-    not_found = []
-    
-    for idx, record in enumerate(eobi_records, 1):
-        name = record.get("NAME", "").strip()
-        cnic = record.get("CNIC", "").strip()
-        eobi_no = record.get("EOBI_NO", "").strip()
-        
-        if not name:
-            print(f"  [{idx}/{len(eobi_records)}] Skipping record - no name")
-            continue
-        
-        print(f"  [{idx}/{len(eobi_records)}] Processing: {name} (EOBI: {eobi_no})")
-        
-        # Find employee
-        employee_id, employee_name = match_employee(client, name, cnic)
-        
-        if not employee_id:
-            not_found.append({"name": name, "cnic": cnic, "eobi_no": eobi_no})
-            print(f"    ❌ Employee not found")
-            continue
-        
-        matched += 1
-        print(f"    ✓ Found: Employee ID {employee_id} ({employee_name})")
-        
-        # Insert into Employee_EOBI table
-        insert_result = insert_eobi_record(client, employee_id, record, payroll_month)
-        if insert_result is True:
-            inserted += 1
-            if idx % 20 == 0:  # Print every 20th to reduce noise
-                print(f"    ✓ Inserted {inserted} records so far...")
-        elif insert_result is False:
-            skipped_duplicates += 1
-            # Don't print for every skipped duplicate to reduce noise
-        else:
-            # insert_result contains error message
-            skipped_duplicates += 1
-            if "duplicate" not in str(insert_result).lower():
-                print(f"    ⚠ Error for {name}: {str(insert_result)[:100]}")
-        
-        # Update Employees table with EOBI number and missing fields
-        if update_employee_eobi(client, employee_id, record):
-            updated += 1
-            print(f"    ✓ Updated Employees table")
-    
-    print("\n" + "="*60)
-    print("SUMMARY")
-    print("="*60)
-    print(f"Total records processed: {len(eobi_records)}")
-    print(f"Payroll Month: {payroll_month}")
-    print(f"Employees matched: {matched}")
-    print(f"EOBI records inserted: {inserted}")
-    print(f"EOBI records skipped (duplicates): {skipped_duplicates}")
-    print(f"Employees table updated: {updated}")
-    print(f"Employees not found: {len(not_found)}")
-    
-    if not_found:
-        print("\nEmployees not found:")
-        for nf in not_found[:10]:  # Show first 10
-            print(f"  - {nf['name']} (CNIC: {nf['cnic']}, EOBI: {nf['eobi_no']})")
-        if len(not_found) > 10:
-            print(f"  ... and {len(not_found) - 10} more")
-
-if __name__ == "__main__":
-    main()
+#!/usr/bin/env python3
+"""
+Import EOBI data from CSV file and update Employees table with EOBI numbers and missing data.
+
+The CSV is loaded straight into a temporary BigQuery table with one load
+job; date parsing, employee matching, deduplication and the Employees
+updates all run inside BigQuery. Total round-trips: three jobs plus a
+summary query, regardless of file size.
+
+Usage:
+    python scripts/import_eobi_data.py <csv_file_path>
+"""
+
+import re
+import sys
+import os
+import uuid
+from datetime import datetime
+from google.cloud import bigquery
+from google.oauth2 import service_account
+
+# Add parent directory to path to import config
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Configuration - Update these based on your setup
+PROJECT_ID = os.getenv("GCP_PROJECT_ID", "test-imagine-web")
+DATASET_ID = os.getenv("BQ_DATASET", "Vyro_Business_Paradox")
+EMPLOYEES_TABLE = os.getenv("BQ_TABLE", "Employees")
+EOBI_TABLE = os.getenv("BQ_EOBI_TABLE", "Employee_EOBI")
+CREDENTIALS_PATH = os.getenv("GOOGLE_APPLICATION_CREDENTIALS", "Credentials/test-imagine-web-18d4f9a43aef.json")
+
+# Fully-qualified table references, resolved once at import time
+EMPLOYEES_TABLE_REF = f"{PROJECT_ID}.{DATASET_ID}.{EMPLOYEES_TABLE}"
+EOBI_TABLE_REF = f"{PROJECT_ID}.{DATASET_ID}.{EOBI_TABLE}"
+
+# Matches patterns like "November 2025" or "Nov 2025" in filenames
+_MONTH_RE = re.compile(r'(\w+)\s+(\d{4})', re.IGNORECASE)
+
+# Month names indexed by (month - 1); both "Apr" and "April" resolve
+# through the first three letters
+_MONTHS3 = ("jan", "feb", "mar", "apr", "may", "jun",
+            "jul", "aug", "sep", "oct", "nov", "dec")
+
+# Columns of the EOBI CSV in file order. The load job maps them
+# positionally so the messy original headers (parentheses, stray
+# spaces) never need cleaning.
+_RAW_CSV_SCHEMA = [
+    bigquery.SchemaField("EMP_AREA_CODE", "STRING"),
+    bigquery.SchemaField("EMP_REG_SERIAL_NO", "STRING"),
+    bigquery.SchemaField("EMP_SUB_AREA_CODE", "STRING"),
+    bigquery.SchemaField("EMP_SUB_SERIAL_NO", "STRING"),
+    bigquery.SchemaField("NAME", "STRING"),
+    bigquery.SchemaField("EOBI_NO", "STRING"),
+    bigquery.SchemaField("CNIC", "STRING"),
+    bigquery.SchemaField("NIC", "STRING"),
+    bigquery.SchemaField("DOB", "STRING"),
+    bigquery.SchemaField("DOJ", "STRING"),
+    bigquery.SchemaField("DOE", "STRING"),
+    bigquery.SchemaField("NO_OF_DAYS_WORKED", "STRING"),
+    bigquery.SchemaField("From_Date", "STRING"),
+    bigquery.SchemaField("To_Date", "STRING"),
+]
+
+def _sql_eobi_date(col):
+    """SQL expression parsing an EOBI date (DD-MMM-YY or DD-Month-YY).
+
+    Mirrors the old Python parser's 2-digit-year pivot: years < 50 are
+    2000s, years >= 50 are 1900s. PARSE_DATE's %y pivots at 69 instead,
+    so parses landing in 2050-2068 are pushed back a century.
+    """
+    parsed = (f"COALESCE(SAFE.PARSE_DATE('%d-%b-%y', TRIM({col})), "
+              f"SAFE.PARSE_DATE('%d-%B-%y', TRIM({col})))")
+    return (f"CASE WHEN EXTRACT(YEAR FROM {parsed}) >= 2050 "
+            f"THEN DATE_SUB({parsed}, INTERVAL 100 YEAR) ELSE {parsed} END")
+
+# Shared CTE: raw CSV rows with parsed dates and the matched
+# Employee_ID (by CNIC first, then by normalized name)
+_MATCHED_CTE = f"""
+WITH raw AS (
+    SELECT *
+    FROM `{{raw}}`
+    WHERE NAME IS NOT NULL AND TRIM(NAME) != ''
+),
+by_cnic AS (
+    SELECT TRIM(CNIC_ID) AS cnic, MIN(Employee_ID) AS Employee_ID
+    FROM `{EMPLOYEES_TABLE_REF}`
+    WHERE CNIC_ID IS NOT NULL AND TRIM(CNIC_ID) != ''
+    GROUP BY cnic
+),
+by_name AS (
+    SELECT LOWER(TRIM(Full_Name)) AS name_norm, MIN(Employee_ID) AS Employee_ID
+    FROM `{EMPLOYEES_TABLE_REF}`
+    WHERE Full_Name IS NOT NULL
+    GROUP BY name_norm
+),
+matched AS (
+    SELECT
+        r.*,
+        {_sql_eobi_date('r.DOB')} AS DOB_parsed,
+        {_sql_eobi_date('r.DOJ')} AS DOJ_parsed,
+        {_sql_eobi_date('r.DOE')} AS DOE_parsed,
+        {_sql_eobi_date('r.From_Date')} AS From_Date_parsed,
+        {_sql_eobi_date('r.To_Date')} AS To_Date_parsed,
+        COALESCE(c.Employee_ID, n.Employee_ID) AS Employee_ID
+    FROM raw r
+    LEFT JOIN by_cnic c ON TRIM(r.CNIC) = c.cnic
+    LEFT JOIN by_name n ON LOWER(TRIM(r.NAME)) = n.name_norm
+)
+"""
+
+# Insert matched rows that do not already exist for this payroll month;
+# EOBI_IDs are assigned above the current maximum in the same statement
+_EOBI_INSERT_SQL = f"""
+INSERT INTO `{EOBI_TABLE_REF}` (
+    EOBI_ID,
+    Employee_ID,
+    Payroll_Month,
+    EMP_AREA_CODE,
+    EMP_REG_SERIAL_NO,
+    EMP_SUB_AREA_CODE,
+    EMP_SUB_SERIAL_NO,
+    EOBI_NO,
+    DOB,
+    DOJ,
+    DOE,
+    NO_OF_DAYS_WORKED,
+    From_Date,
+    To_Date,
+    Loaded_At,
+    Created_At
+)
+{_MATCHED_CTE}
+SELECT
+    ROW_NUMBER() OVER () + (SELECT COALESCE(MAX(EOBI_ID), 0) FROM `{EOBI_TABLE_REF}`),
+    m.Employee_ID,
+    DATE '{{payroll_month}}',
+    COALESCE(NULLIF(TRIM(m.EMP_AREA_CODE), ''), 'FAA'),
+    COALESCE(NULLIF(TRIM(m.EMP_REG_SERIAL_NO), ''), '4320'),
+    COALESCE(NULLIF(m.EMP_SUB_AREA_CODE, ''), ' '),
+    COALESCE(NULLIF(TRIM(m.EMP_SUB_SERIAL_NO), ''), '0'),
+    COALESCE(TRIM(m.EOBI_NO), ''),
+    m.DOB_parsed,
+    m.DOJ_parsed,
+    m.DOE_parsed,
+    COALESCE(SAFE_CAST(m.NO_OF_DAYS_WORKED AS NUMERIC), 0),
+    m.From_Date_parsed,
+    m.To_Date_parsed,
+    CURRENT_TIMESTAMP(),
+    CURRENT_TIMESTAMP()
+FROM matched m
+WHERE m.Employee_ID IS NOT NULL
+  AND NOT EXISTS (
+      SELECT 1
+      FROM `{EOBI_TABLE_REF}` t
+      WHERE t.Employee_ID = m.Employee_ID
+        AND t.Payroll_Month = DATE '{{payroll_month}}'
+  )
+"""
+
+# One MERGE backfills EOBI number, DOB, joining date and CNIC on
+# Employees; COALESCE keeps existing values where the CSV had no data
+_EMPLOYEE_UPDATE_MERGE_SQL = f"""
+MERGE `{EMPLOYEES_TABLE_REF}` T
+USING (
+    {_MATCHED_CTE}
+    SELECT
+        Employee_ID,
+        MAX(NULLIF(TRIM(EOBI_NO), '')) AS EOBI_Number,
+        MAX(DOB_parsed) AS Date_of_Birth,
+        MAX(DOJ_parsed) AS Joining_Date,
+        MAX(NULLIF(TRIM(CNIC), '')) AS CNIC_ID
+    FROM matched
+    WHERE Employee_ID IS NOT NULL
+    GROUP BY Employee_ID
+) S
+ON T.Employee_ID = S.Employee_ID
+WHEN MATCHED THEN UPDATE SET
+    EOBI_Number = COALESCE(S.EOBI_Number, T.EOBI_Number),
+    Date_of_Birth = COALESCE(S.Date_of_Birth, T.Date_of_Birth),
+    Joining_Date = COALESCE(S.Joining_Date, T.Joining_Date),
+    CNIC_ID = COALESCE(S.CNIC_ID, T.CNIC_ID),
+    Updated_At = CURRENT_DATETIME()
+"""
+
+# Match statistics plus a sample of unmatched employees for the report
+_SUMMARY_SQL = _MATCHED_CTE + """
+SELECT
+    COUNT(*) AS total_rows,
+    COUNTIF(Employee_ID IS NOT NULL) AS matched,
+    COUNTIF(Employee_ID IS NULL) AS not_found,
+    ARRAY_AGG(IF(Employee_ID IS NULL,
+                 STRUCT(NAME AS name, CNIC AS cnic, EOBI_NO AS eobi_no),
+                 NULL) IGNORE NULLS LIMIT 10) AS not_found_sample
+FROM matched
+"""
+
+def get_bigquery_client():
+    """Initialize BigQuery client."""
+    credentials = service_account.Credentials.from_service_account_file(CREDENTIALS_PATH)
+    return bigquery.Client(credentials=credentials, project=PROJECT_ID)
+
+def extract_payroll_month(file_path):
+    """Extract payroll month from CSV filename.
+
+    Examples:
+        "EOBI updated data- AI - To be uploaded November 2025 (1).csv" -> "2025-11-01"
+        "eobi-november-2025.csv" -> "2025-11-01"
+    """
+    filename = os.path.basename(file_path)
+
+    match = _MONTH_RE.search(filename)
+
+    if match:
+        month_str = match.group(1)[:3].lower()
+        year = int(match.group(2))
+        if month_str in _MONTHS3:
+            month = _MONTHS3.index(month_str) + 1
+            return f"{year}-{month:02d}-01"
+
+    # Default to current month if not found
+    now = datetime.now()
+    return f"{now.year}-{now.month:02d}-01"
+
+def load_raw_csv(client, csv_file):
+    """Load the raw EOBI CSV into a temporary table with one load job.
+
+    BigQuery's load path ingests the file in bulk — no per-row Python
+    parsing and no DML. Returns the temporary table reference.
+    """
+    raw_table = f"{PROJECT_ID}.{DATASET_ID}._tmp_eobi_raw_{uuid.uuid4().hex}"
+    job_config = bigquery.LoadJobConfig(
+        source_format=bigquery.SourceFormat.CSV,
+        skip_leading_rows=1,
+        schema=_RAW_CSV_SCHEMA,
+        write_disposition="WRITE_TRUNCATE",
+        allow_quoted_newlines=True,
+    )
+    with open(csv_file, "rb") as f:
+        client.load_table_from_file(f, raw_table, job_config=job_config).result()
+    return raw_table
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python scripts/import_eobi_data.py <csv_file_path>")
+        sys.exit(1)
+
+    csv_file = sys.argv[1]
+
+    if not os.path.exists(csv_file):
+        print(f"Error: CSV file not found: {csv_file}")
+        sys.exit(1)
+
+    # Extract payroll month from filename
+    payroll_month = extract_payroll_month(csv_file)
+    print(f"Detected Payroll Month: {payroll_month}")
+
+    client = get_bigquery_client()
+
+    print(f"Loading raw CSV into BigQuery: {csv_file}")
+    raw_table = load_raw_csv(client, csv_file)
+
+    try:
+        print("Inserting EOBI records...")
+        insert_job = client.query(
+            _EOBI_INSERT_SQL.format(raw=raw_table, payroll_month=payroll_month)
+        )
+        insert_job.result()  # Wait for completion
+        inserted = insert_job.num_dml_affected_rows or 0
+
+        print("Updating Employees table...")
+        update_job = client.query(_EMPLOYEE_UPDATE_MERGE_SQL.format(raw=raw_table))
+        update_job.result()
+        updated = update_job.num_dml_affected_rows or 0
+
+        summary = next(iter(client.query(_SUMMARY_SQL.format(raw=raw_table)).result()))
+    finally:
+        client.delete_table(raw_table, not_found_ok=True)
+
+    print("\n" + "="*60)
+    print("SUMMARY")
+    print("="*60)
+    print(f"Total records processed: {summary.total_rows}")
+    print(f"Payroll Month: {payroll_month}")
+    print(f"Employees matched: {summary.matched}")
+    print(f"EOBI records inserted: {inserted}")
+    print(f"EOBI records skipped (already loaded): {summary.matched - inserted}")
+    print(f"Employees table updated: {updated}")
+    print(f"Employees not found: {summary.not_found}")
+
+    if summary.not_found:
+        print("\nEmployees not found:")
+        for nf in summary.not_found_sample:
+            print(f"  - {nf['name']} (CNIC: {nf['cnic']}, EOBI: {nf['eobi_no']})")
+        if summary.not_found > len(summary.not_found_sample):
+            print(f"  ... and {summary.not_found - len(summary.not_found_sample)} more")
+
+if __name__ == "__main__":
+    main()
@@ -1,465 +1,591 @@
-#!/usr/bin/env python3
-"""
-Import Pay Template Data (New Hires, Leavers, Increments) to BigQuery
-
-Usage:
-    python scripts/import_pay_template_data.py <type> <csv_file_path> [month]
-    
-    type: "new-hires", "leavers", or "increments"
-    csv_file_path: Path to CSV file
-    month: Optional YYYY-MM format (will be extracted from dates if not provided)
-
-Example:
-    python scripts/import_pay_template_data.py new-hires new_hires_dec_2025.csv 2025-12
-    python scripts/import_pay_template_data.py leavers leavers_dec_2025.csv 2025-12
-    python scripts/import_pay_template_data.py increments increments_nov_dec_2025.csv
-"""
-
-import csv
-import sys
-import os
-import re
-from datetime import datetime
-from typing import Optional, Dict, Any
-from google.cloud import bigquery
-from google.oauth2 import service_account
-
-# Add parent directory to path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-# Configuration
-PROJECT_ID = os.getenv("GCP_PROJECT_ID", "test-imagine-web")
-DATASET_ID = os.getenv("BQ_DATASET", "Vyro_Business_Paradox")
-EMPLOYEES_TABLE = os.getenv("BQ_TABLE", "Employees")
-SALARIES_TABLE = "Salaries"
-CREDENTIALS_PATH = os.getenv("GOOGLE_APPLICATION_CREDENTIALS", "Credentials/test-imagine-web-18d4f9a43aef.json")
-
-EMPLOYEES_TABLE_REF = f"`{PROJECT_ID}.{DATASET_ID}.{EMPLOYEES_TABLE}`"
-SALARIES_TABLE_REF = f"`{PROJECT_ID}.{DATASET_ID}.{SALARIES_TABLE}`"
-
-def get_bigquery_client():
-    """Initialize BigQuery client."""
-    credentials = service_account.Credentials.from_service_account_file(CREDENTIALS_PATH)
-    return bigquery.Client(credentials=credentials, project=PROJECT_ID)
-
-def parse_date(date_str: str) -> Optional[str]:
-    """
-    Parse various date formats to YYYY-MM-DD.
-    Handles: "1 December 2025", "1st November 2025", "30th October 2025", "31 October", etc.
-    """
-    if not date_str or date_str.strip() == "":
-        return None
-    
-    date_str = date_str.strip()
-    
-    # Remove ordinal suffixes (1st, 2nd, 3rd, 4th, etc.)
-    date_str = re.sub(r'(\d+)(st|nd|rd|th)', r'\1', date_str)
-    
-    # Month name mapping
-    month_map = {
-        "january": 1, "jan": 1,
-        "february": 2, "feb": 2,
-        "march": 3, "mar": 3,
-        "april": 4, "apr": 4,
-        "may": 5,
-        "june": 6, "jun": 6,
-        "july": 7, "jul": 7,
-        "august": 8, "aug": 8,
-        "september": 9, "sep": 9, "sept": 9,
-        "october": 10, "oct": 10,
-        "november": 11, "nov": 11,
-        "december": 12, "dec": 12
-    }
-    
-    # Try parsing formats
-    patterns = [
-        (r'(\d+)\s+(\w+)\s+(\d{4})', lambda m: (int(m.group(1)), month_map.get(m.group(2).lower()), int(m.group(3)))),
-        (r'(\d+)\s+(\w+)', lambda m: (int(m.group(1)), month_map.get(m.group(2).lower()), datetime.now().year)),
-    ]
-    
-    for pattern, extractor in patterns:
-        match = re.match(pattern, date_str, re.IGNORECASE)
-        if match:
-            try:
-                day, month_num, year = extractor(match)
-                if month_num:
-                    return f"{year}-{month_num:02d}-{day:02d}"
-            except:
-                continue
-    
-    # Fallback: try pandas datetime parsing
-    try:
-        import pandas as pd
-        dt = pd.to_datetime(date_str, errors='coerce')
-        if pd.notna(dt):
-            return dt.strftime("%Y-%m-%d")
-    except:
-        pass
-    
-    return None
-
-def extract_month_from_date(date_str: str) -> Optional[str]:
-    """Extract YYYY-MM format from date string."""
-    date = parse_date(date_str)
-    if date:
-        return date[:7]  # Return YYYY-MM
-    return None
-
-def clean_numeric(value: Any) -> Optional[float]:
-    """Clean and convert numeric values, handling commas and N/A."""
-    if value is None or value == "" or str(value).strip().lower() in ["n/a", "na", "-", ""]:
-        return None
-    
-    if isinstance(value, (int, float)):
-        return float(value)
-    
-    # Remove commas and spaces
-    cleaned = str(value).replace(',', '').replace(' ', '').strip()
-    if cleaned == "" or cleaned.lower() == "nan":
-        return None
-    
-    try:
-        return float(cleaned)
-    except (ValueError, TypeError):
-        return None
-
-def lookup_employee_id(bigquery_client, name: str, email: Optional[str] = None) -> Optional[str]:
-    """Lookup Employee ID from Employees table by name or email."""
-    try:
-        query = f"""
-        SELECT Employee_ID
-        FROM {EMPLOYEES_TABLE_REF}
-        WHERE Full_Name = @name
-           OR Official_Email = @email
-        LIMIT 1
-        """
-        
-        job_config = bigquery.QueryJobConfig(
-            query_parameters=[
-                bigquery.ScalarQueryParameter("name", "STRING", name),
-                bigquery.ScalarQueryParameter("email", "STRING", email or ""),
-            ]
-        )
-        
-        query_job = bigquery_client.query(query, job_config=job_config)
-        results = query_job.result()
-        
-        for row in results:
-            return str(row.Employee_ID)
-        
-        return None
-    except Exception as e:
-        print(f"Error looking up Employee ID for {name}: {e}")
-        return None
-
-def lookup_previous_salary(bigquery_client, employee_id: str, currency: str) -> Optional[float]:
-    """Lookup Previous Salary from Salaries table or Employees table."""
-    try:
-        # First try: Salaries table (Gross_Income)
-        query = f"""
-        SELECT Gross_Income
-        FROM {SALARIES_TABLE_REF}
-        WHERE Employee_ID = @employeeId
-          AND Currency = @currency
-        ORDER BY Payroll_Month DESC
-        LIMIT 1
-        """
-        
-        job_config = bigquery.QueryJobConfig(
-            query_parameters=[
-                bigquery.ScalarQueryParameter("employeeId", "INT64", int(employee_id)),
-                bigquery.ScalarQueryParameter("currency", "STRING", currency),
-            ]
-        )
-        
-        query_job = bigquery_client.query(query, job_config=job_config)
-        results = query_job.result()
-        
-        for row in results:
-            if row.Gross_Income is not None:
-                return float(row.Gross_Income)
-        
-        # Second try: Employees table (Gross_Salary)
-        query = f"""
-        SELECT Gross_Salary
-        FROM {EMPLOYEES_TABLE_REF}
-        WHERE Employee_ID = @employeeId
-        """
-        
-        job_config = bigquery.QueryJobConfig(
-            query_parameters=[
-                bigquery.ScalarQueryParameter("employeeId", "INT64", int(employee_id)),
-            ]
-        )
-        
-        query_job = bigquery_client.query(query, job_config=job_config)
-        results = query_job.result()
-        
-        for row in results:
-            if row.Gross_Salary is not None:
-                return float(row.Gross_Salary)
-        
-        return None
-    except Exception as e:
-        print(f"Error looking up Previous Salary for Employee ID {employee_id}: {e}")
-        return None
-
-def import_new_hires(csv_path: str, month: Optional[str] = None):
-    """Import new hires from CSV file."""
-    bigquery_client = get_bigquery_client()
-    table_ref = f"`{PROJECT_ID}.{DATASET_ID}.Pay_Template_New_Hires`"
-    
-    records = []
-    lookup_count = 0
-    
-    print(f"\nReading new hires from: {csv_path}")
-    
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            # Extract month from Date_of_Joining if not provided
-            date_of_joining = row.get('Date of Joining', '').strip()
-            record_month = month or extract_month_from_date(date_of_joining)
-            
-            if not record_month:
-                print(f"Warning: Could not extract month from Date of Joining: {date_of_joining}")
-                continue
-            
-            # Lookup Employee ID if missing
-            employee_id = row.get('Employee ID', '').strip()
-            employee_id_lookup = False
-            
-            if not employee_id and row.get('Employee Name'):
-                looked_up_id = lookup_employee_id(
-                    bigquery_client,
-                    row['Employee Name'],
-                    row.get('Official Email', '').strip() or None
-                )
-                if looked_up_id:
-                    employee_id = looked_up_id
-                    employee_id_lookup = True
-                    lookup_count += 1
-            
-            # Parse date
-            parsed_date = parse_date(date_of_joining)
-            
-            record = {
-                'Type': 'New Hire',
-                'Month': record_month,
-                'Employee_ID': employee_id or None,
-                'Employee_Name': row.get('Employee Name', '').strip(),
-                'Designation': row.get('Designation', '').strip() or None,
-                'Official_Email': row.get('Official Email', '').strip() or None,
-                'Date_of_Joining': parsed_date,
-                'Currency': row.get('Currency', 'PKR').strip(),
-                'Salary': clean_numeric(row.get('Salary', 0)),
-                'Employment_Location': row.get('Employment Location', '').strip() or None,
-                'Bank_Name': row.get('Bank Name', '').strip() or None,
-                'Bank_Account_Title': row.get('Bank Account Title', '').strip() or None,
-                'Bank_Account_Number_IBAN': row.get('Bank Account Number-IBAN (24 digits)', '').strip() or None,
-                'Swift_Code_BIC': row.get('Swift Code/ BIC Code', '').strip() or None,
-                'Comments_by_Aun': row.get('Comments by Aun', '').strip() or None,
-            }
-            
-            records.append(record)
-    
-    print(f"Processed {len(records)} new hire records")
-    print(f"Looked up {lookup_count} Employee IDs")
-    
-    if not records:
-        print("No records to insert.")
-        return
-    
-    # Insert to BigQuery
-    print(f"\nInserting {len(records)} records into {table_ref}...")
-    
-    errors = bigquery_client.insert_rows_json(table_ref, records)
-    if errors:
-        print(f"Errors occurred: {errors}")
-    else:
-        print(f"Successfully inserted {len(records)} new hire records!")
-
-def import_leavers(csv_path: str, month: Optional[str] = None):
-    """Import leavers from CSV file."""
-    bigquery_client = get_bigquery_client()
-    table_ref = f"`{PROJECT_ID}.{DATASET_ID}.Pay_Template_Leavers`"
-    
-    records = []
-    lookup_count = 0
-    
-    print(f"\nReading leavers from: {csv_path}")
-    
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            # Extract month from Employment End Date if not provided
-            employment_end_date = row.get('Employment End Date', '').strip()
-            record_month = month or extract_month_from_date(employment_end_date)
-            
-            if not record_month:
-                print(f"Warning: Could not extract month from Employment End Date: {employment_end_date}")
-                continue
-            
-            # Lookup Employee ID if missing
-            employee_id = row.get('Employee ID', '').strip()
-            employee_id_lookup = False
-            
-            if not employee_id and row.get('Employee Name'):
-                looked_up_id = lookup_employee_id(bigquery_client, row['Employee Name'])
-                if looked_up_id:
-                    employee_id = looked_up_id
-                    employee_id_lookup = True
-                    lookup_count += 1
-            
-            # Parse date
-            parsed_date = parse_date(employment_end_date)
-            
-            record = {
-                'Type': 'Leaver',
-                'Month': record_month,
-                'Employee_ID': employee_id or None,
-                'Employee_Name': row.get('Employee Name', '').strip(),
-                'Employment_End_Date': parsed_date,
-                'Payroll_Type': row.get('Payroll type', 'PKR').strip(),
-                'Comments': row.get('Comments', '').strip() or None,
-                'Devices_Returned': row.get('Devices Returned?', '').strip() or None,
-                'Comments_by_Aun': row.get('Comments by Aun', '').strip() or None,
-            }
-            
-            records.append(record)
-    
-    print(f"Processed {len(records)} leaver records")
-    print(f"Looked up {lookup_count} Employee IDs")
-    
-    if not records:
-        print("No records to insert.")
-        return
-    
-    # Insert to BigQuery
-    print(f"\nInserting {len(records)} records into {table_ref}...")
-    
-    errors = bigquery_client.insert_rows_json(table_ref, records)
-    if errors:
-        print(f"Errors occurred: {errors}")
-    else:
-        print(f"Successfully inserted {len(records)} leaver records!")
-
-def import_increments(csv_path: str, month: Optional[str] = None):
-    """Import increments from CSV file."""
-    bigquery_client = get_bigquery_client()
-    table_ref = f"`{PROJECT_ID}.{DATASET_ID}.Pay_Template_Increments`"
-    
-    records = []
-    employee_id_lookup_count = 0
-    salary_lookup_count = 0
-    
-    print(f"\nReading increments from: {csv_path}")
-    
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            # Extract month from Effective date if not provided
-            effective_date = row.get('Effective date', '').strip()
-            record_month = month or extract_month_from_date(effective_date)
-            
-            if not record_month:
-                print(f"Warning: Could not extract month from Effective date: {effective_date}")
-                continue
-            
-            # Lookup Employee ID if missing
-            employee_id = row.get('Employee ID', '').strip()
-            employee_id_lookup = False
-            
-            if not employee_id and row.get('Employee Name'):
-                looked_up_id = lookup_employee_id(bigquery_client, row['Employee Name'])
-                if looked_up_id:
-                    employee_id = looked_up_id
-                    employee_id_lookup = True
-                    employee_id_lookup_count += 1
-            
-            # Lookup Previous Salary if missing
-            previous_salary = clean_numeric(row.get('Previous Salary', ''))
-            previous_salary_lookup = False
-            
-            if previous_salary is None and employee_id and row.get('Currency'):
-                looked_up_salary = lookup_previous_salary(bigquery_client, employee_id, row['Currency'])
-                if looked_up_salary is not None:
-                    previous_salary = looked_up_salary
-                    previous_salary_lookup = True
-                    salary_lookup_count += 1
-            
-            # Parse date
-            parsed_date = parse_date(effective_date)
-            
-            record = {
-                'Type': 'Increment',
-                'Month': record_month,
-                'Employee_ID': employee_id or None,
-                'Employee_Name': row.get('Employee Name', '').strip(),
-                'Currency': row.get('Currency', 'PKR').strip(),
-                'Previous_Salary': previous_salary,
-                'Updated_Salary': clean_numeric(row.get('Updated Salary', 0)),
-                'Effective_Date': parsed_date,
-                'Comments': row.get('Comments', '').strip() or None,
-                'Remarks': row.get('Remarks', '').strip() or None,
-            }
-            
-            records.append(record)
-    
-    print(f"Processed {len(records)} increment records")
-    print(f"Looked up {employee_id_lookup_count} Employee IDs")
-    print(f"Looked up {salary_lookup_count} Previous Salaries")
-    
-    if not records:
-        print("No records to insert.")
-        return
-    
-    # Insert to BigQuery
-    print(f"\nInserting {len(records)} records into {table_ref}...")
-    
-    errors = bigquery_client.insert_rows_json(table_ref, records)
-    if errors:
-        print(f"Errors occurred: {errors}")
-    else:
-        print(f"Successfully inserted {len(records)} increment records!")
-
-def main():
-    if len(sys.argv) < 3:
-        print("Usage: python scripts/import_pay_template_data.py <type> <csv_file_path> [month]")
-        print("  type: 'new-hires', 'leavers', or 'increments'")
-        print("  csv_file_path: Path to CSV file")
-        print("  month: Optional YYYY-MM format (will be extracted from dates if not provided)")
-        sys.exit(1)
-    
-    import_type = sys.argv[1].lower()
-    csv_path = sys.argv[2]
-    month = sys.argv[3] if len(sys.argv) > 3 else None
-    
-    if not os.path.exists(csv_path):
-        print(f"Error: CSV file not found: {csv_path}")
-        sys.exit(1)
-    
-    print("=" * 80)
-    print("PAY TEMPLATE DATA IMPORT")
-    print("=" * 80)
-    print(f"Type: {import_type}")
-    print(f"CSV File: {csv_path}")
-    print(f"Month: {month or '(will be extracted from dates)'}")
-    print("=" * 80)
-    
-    if import_type == "new-hires":
-        import_new_hires(csv_path, month)
-    elif import_type == "leavers":
-        import_leavers(csv_path, month)
-    elif import_type == "increments":
-        import_increments(csv_path, month)
-    else:
-        print(f"Error: Unknown type '{import_type}'. Must be 'new-hires', 'leavers', or 'increments'")
-        sys.exit(1)
-    
-    print("\n" + "=" * 80)
-    print("IMPORT COMPLETED")
-    print("=" * 80)
-
-if __name__ == "__main__":
-    main()
+#!/usr/bin/env python3
+"""
+Import Pay Template Data (New Hires, Leavers, Increments) to BigQuery
+
+Usage:
+    python scripts/import_pay_template_data.py <type> <csv_file_path> [month]
+    
+    type: "new-hires", "leavers", or "increments"
+    csv_file_path: Path to CSV file
+    month: Optional YYYY-MM format (will be extracted from dates if not provided)
+
+Example:
+    python scripts/import_pay_template_data.py new-hires new_hires_dec_2025.csv 2025-12
+    python scripts/import_pay_template_data.py leavers leavers_dec_2025.csv 2025-12
+    python scripts/import_pay_template_data.py increments increments_nov_dec_2025.csv
+"""
+
+import sys
+import os
+import re
+import json
+import tempfile
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+from dataclasses import asdict, dataclass, is_dataclass
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional, Any
+import pandas as pd
+from google.auth.transport.requests import AuthorizedSession
+from google.cloud import bigquery
+from google.oauth2 import service_account
+from requests.adapters import HTTPAdapter
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Configuration
+PROJECT_ID = os.getenv("GCP_PROJECT_ID", "test-imagine-web")
+DATASET_ID = os.getenv("BQ_DATASET", "Vyro_Business_Paradox")
+EMPLOYEES_TABLE = os.getenv("BQ_TABLE", "Employees")
+SALARIES_TABLE = "Salaries"
+CREDENTIALS_PATH = os.getenv("GOOGLE_APPLICATION_CREDENTIALS", "Credentials/test-imagine-web-18d4f9a43aef.json")
+
+EMPLOYEES_TABLE_REF = f"`{PROJECT_ID}.{DATASET_ID}.{EMPLOYEES_TABLE}`"
+SALARIES_TABLE_REF = f"`{PROJECT_ID}.{DATASET_ID}.{SALARIES_TABLE}`"
+
+# Precompiled date patterns (parse_date runs once or twice per CSV row)
+_ORDINAL_RE = re.compile(r'(\d+)(st|nd|rd|th)')
+_DATE_RE_FULL = re.compile(r'(\d+)\s+(\w+)\s+(\d{4})', re.IGNORECASE)
+_DATE_RE_PARTIAL = re.compile(r'(\d+)\s+(\w+)', re.IGNORECASE)
+
+# Month name mapping
+MONTH_MAP = {
+    "january": 1, "jan": 1,
+    "february": 2, "feb": 2,
+    "march": 3, "mar": 3,
+    "april": 4, "apr": 4,
+    "may": 5,
+    "june": 6, "jun": 6,
+    "july": 7, "jul": 7,
+    "august": 8, "aug": 8,
+    "september": 9, "sep": 9, "sept": 9,
+    "october": 10, "oct": 10,
+    "november": 11, "nov": 11,
+    "december": 12, "dec": 12
+}
+
+# Slotted record types: one per pay-template table. Compared with a
+# 15-key dict per row, slotted instances are smaller and faster to
+# build, which adds up on large imports.
+@dataclass(slots=True)
+class NewHireRecord:
+    Type: str
+    Month: str
+    Employee_ID: Optional[str]
+    Employee_Name: str
+    Designation: Optional[str]
+    Official_Email: Optional[str]
+    Date_of_Joining: Optional[str]
+    Currency: str
+    Salary: Optional[float]
+    Employment_Location: Optional[str]
+    Bank_Name: Optional[str]
+    Bank_Account_Title: Optional[str]
+    Bank_Account_Number_IBAN: Optional[str]
+    Swift_Code_BIC: Optional[str]
+    Comments_by_Aun: Optional[str]
+
+@dataclass(slots=True)
+class LeaverRecord:
+    Type: str
+    Month: str
+    Employee_ID: Optional[str]
+    Employee_Name: str
+    Employment_End_Date: Optional[str]
+    Payroll_Type: str
+    Comments: Optional[str]
+    Devices_Returned: Optional[str]
+    Comments_by_Aun: Optional[str]
+
+@dataclass(slots=True)
+class IncrementRecord:
+    Type: str
+    Month: str
+    Employee_ID: Optional[str]
+    Employee_Name: str
+    Currency: str
+    Previous_Salary: Optional[float]
+    Updated_Salary: Optional[float]
+    Effective_Date: Optional[str]
+    Comments: Optional[str]
+    Remarks: Optional[str]
+
+def insert_records(bigquery_client, table_id, records, job_config=None):
+    """Append records to a table with a batch load job.
+
+    records may be any iterable: rows are spooled straight to the
+    temporary NDJSON file as they are produced, so memory stays flat no
+    matter how large the CSV is, and the load job avoids the per-row
+    streaming quota and cost of insert_rows_json. Returns
+    (errors, row_count); errors is empty on success.
+    """
+    if job_config is None:
+        job_config = bigquery.LoadJobConfig(
+            source_format=bigquery.SourceFormat.NEWLINE_DELIMITED_JSON,
+            write_disposition="WRITE_APPEND",
+        )
+    row_count = 0
+    if orjson is not None:
+        dumps = orjson.dumps  # serializes dataclasses natively
+    else:
+        def dumps(r):
+            return json.dumps(asdict(r) if is_dataclass(r) else r).encode("utf-8")
+    with tempfile.NamedTemporaryFile(mode="w+b", suffix=".ndjson") as ndjson_file:
+        for record in records:
+            ndjson_file.write(dumps(record))
+            ndjson_file.write(b"\n")
+            row_count += 1
+        if row_count == 0:
+            return [], 0
+        ndjson_file.seek(0)
+        load_job = bigquery_client.load_table_from_file(
+            ndjson_file, table_id, job_config=job_config
+        )
+        try:
+            load_job.result()
+        except Exception:
+            return load_job.errors or [{"message": "Load job failed"}], row_count
+    return [], row_count
+
+def read_template_csv(csv_path: str) -> list:
+    """Read a pay-template CSV into a list of row dicts.
+
+    pandas parses and strips the whole file with C-implemented column
+    ops; value-level cleaning stays in clean_numeric/parse_date because
+    the templates use formats (ordinals, "N/A", comma grouping) that
+    vectorized converters don't handle.
+    """
+    df = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
+    df = df.apply(lambda col: col.str.strip())
+    return df.to_dict(orient="records")
+
+def load_to_staging(bigquery_client, staging_id, target_id, records):
+    """Load records into a staging table shaped like the target table.
+
+    Reusing the target's schema keeps the staging columns type-compatible
+    with the INSERT ... SELECT that follows, without autodetect guesswork.
+    Returns (errors, row_count).
+    """
+    job_config = bigquery.LoadJobConfig(
+        source_format=bigquery.SourceFormat.NEWLINE_DELIMITED_JSON,
+        write_disposition="WRITE_TRUNCATE",
+        schema=bigquery_client.get_table(target_id).schema,
+    )
+    return insert_records(bigquery_client, staging_id, records, job_config=job_config)
+
+def get_bigquery_client():
+    """Initialize BigQuery client with a pooled HTTP session.
+
+    A widened connection pool lets the schema fetch, load job, and
+    insert query reuse TLS connections instead of paying a handshake
+    per request.
+    """
+    credentials = service_account.Credentials.from_service_account_file(CREDENTIALS_PATH)
+    session = AuthorizedSession(credentials)
+    session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=32))
+    return bigquery.Client(credentials=credentials, project=PROJECT_ID, _http=session)
+
+@lru_cache(maxsize=None)
+def parse_date(date_str: str) -> Optional[str]:
+    """
+    Parse various date formats to YYYY-MM-DD.
+    Handles: "1 December 2025", "1st November 2025", "30th October 2025", "31 October", etc.
+    """
+    if not date_str or date_str.strip() == "":
+        return None
+    
+    date_str = date_str.strip()
+    
+    # Fast path: already ISO-formatted (YYYY-MM-DD)
+    if (len(date_str) == 10 and date_str[4] == '-' and date_str[7] == '-'
+            and date_str[:4].isdigit()):
+        return date_str
+    
+    # Remove ordinal suffixes (1st, 2nd, 3rd, 4th, etc.)
+    date_str = _ORDINAL_RE.sub(r'\1', date_str)
+    
+    # Try parsing formats
+    patterns = [
+        (_DATE_RE_FULL, lambda m: (int(m.group(1)), MONTH_MAP.get(m.group(2).lower()), int(m.group(3)))),
+        (_DATE_RE_PARTIAL, lambda m: (int(m.group(1)), MONTH_MAP.get(m.group(2).lower()), datetime.now().year)),
+    ]
+    
+    for pattern, extractor in patterns:
+        match = pattern.match(date_str)
+        if match:
+            try:
+                day, month_num, year = extractor(match)
+                if month_num:
+                    return f"{year}-{month_num:02d}-{day:02d}"
+            except:
+                continue
+    
+    # Fallback: common explicit formats
+    for fmt in ("%Y-%m-%d", "%d/%m/%Y", "%m/%d/%Y", "%d-%b-%Y", "%d %b %Y"):
+        try:
+            return datetime.strptime(date_str, fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            pass
+    
+    return None
+
+@lru_cache(maxsize=None)
+def extract_month_from_date(date_str: str) -> Optional[str]:
+    """Extract YYYY-MM format from date string."""
+    date = parse_date(date_str)
+    if date:
+        return date[:7]  # Return YYYY-MM
+    return None
+
+_NA_SET = frozenset({"n/a", "na", "-", "nan", ""})
+
+def clean_numeric(value: Any) -> Optional[float]:
+    """Clean and convert numeric values, handling commas and N/A."""
+    if value is None or value == "":
+        return None
+    
+    # Fast path: most cells are already plain numbers
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        pass
+    else:
+        return None if number != number else number  # NaN means missing
+    
+    cleaned = str(value).strip()
+    if cleaned.lower() in _NA_SET:
+        return None
+    
+    # Remove commas and spaces
+    try:
+        return float(cleaned.replace(',', '').replace(' ', ''))
+    except ValueError:
+        return None
+
+# Deduplicated lookup tables for server-side Employee_ID resolution.
+# MIN() pins a deterministic ID when two employees share a name or email.
+_EMPLOYEES_BY_NAME_SQL = f"""
+    SELECT Full_Name, MIN(Employee_ID) AS Employee_ID
+    FROM {EMPLOYEES_TABLE_REF}
+    WHERE Full_Name IS NOT NULL
+    GROUP BY Full_Name
+"""
+
+_EMPLOYEES_BY_EMAIL_SQL = f"""
+    SELECT Official_Email, MIN(Employee_ID) AS Employee_ID
+    FROM {EMPLOYEES_TABLE_REF}
+    WHERE Official_Email IS NOT NULL
+    GROUP BY Official_Email
+"""
+
+def run_staged_insert(bigquery_client, staging_ref, insert_sql):
+    """Run the staging INSERT ... SELECT and drop the staging table.
+
+    query_and_wait issues the query and fetches its outcome in one
+    round-trip instead of create-job-then-poll.
+    """
+    try:
+        result = bigquery_client.query_and_wait(insert_sql)
+        return result.num_dml_affected_rows or 0
+    finally:
+        bigquery_client.delete_table(staging_ref, not_found_ok=True)
+
+def import_new_hires(csv_path: str, month: Optional[str] = None):
+    """Import new hires from CSV file."""
+    bigquery_client = get_bigquery_client()
+    table_ref = f"{PROJECT_ID}.{DATASET_ID}.Pay_Template_New_Hires"
+    
+    staging_ref = f"{table_ref}_staging"
+    
+    print(f"\nReading new hires from: {csv_path}")
+    
+    rows = read_template_csv(csv_path)
+
+    def generate_records():
+        for row in rows:
+            # Extract month from Date_of_Joining if not provided
+            date_of_joining = row.get('Date of Joining', '').strip()
+            record_month = month or extract_month_from_date(date_of_joining)
+
+            if not record_month:
+                print(f"Warning: Could not extract month from Date of Joining: {date_of_joining}")
+                continue
+
+            # Missing Employee IDs are resolved server-side by the INSERT join
+            employee_id = row.get('Employee ID', '').strip()
+
+            # Parse date
+            parsed_date = parse_date(date_of_joining)
+
+            record = NewHireRecord(
+                Type='New Hire',
+                Month=record_month,
+                Employee_ID=employee_id or None,
+                Employee_Name=row.get('Employee Name', '').strip(),
+                Designation=row.get('Designation', '').strip() or None,
+                Official_Email=row.get('Official Email', '').strip() or None,
+                Date_of_Joining=parsed_date,
+                Currency=row.get('Currency', 'PKR').strip(),
+                Salary=clean_numeric(row.get('Salary', 0)),
+                Employment_Location=row.get('Employment Location', '').strip() or None,
+                Bank_Name=row.get('Bank Name', '').strip() or None,
+                Bank_Account_Title=row.get('Bank Account Title', '').strip() or None,
+                Bank_Account_Number_IBAN=row.get('Bank Account Number-IBAN (24 digits)', '').strip() or None,
+                Swift_Code_BIC=row.get('Swift Code/ BIC Code', '').strip() or None,
+                Comments_by_Aun=row.get('Comments by Aun', '').strip() or None,
+            )
+        
+            yield record
+    
+    # Stage the normalized rows, then resolve IDs and insert in one query
+    print(f"\nLoading records into staging table {staging_ref}...")
+    
+    errors, staged = load_to_staging(bigquery_client, staging_ref, table_ref, generate_records())
+    
+    print(f"Processed {staged} new hire records")
+    
+    if errors:
+        print(f"Errors occurred: {errors}")
+        return
+    if not staged:
+        print("No records to insert.")
+        return
+    
+    insert_sql = f"""
+    INSERT INTO `{table_ref}` (
+        Type, Month, Employee_ID, Employee_Name, Designation, Official_Email,
+        Date_of_Joining, Currency, Salary, Employment_Location, Bank_Name,
+        Bank_Account_Title, Bank_Account_Number_IBAN, Swift_Code_BIC,
+        Comments_by_Aun
+    )
+    SELECT
+        t.Type, t.Month,
+        COALESCE(t.Employee_ID,
+                 CAST(n.Employee_ID AS STRING),
+                 CAST(m.Employee_ID AS STRING)) AS Employee_ID,
+        t.Employee_Name, t.Designation, t.Official_Email,
+        t.Date_of_Joining, t.Currency, t.Salary, t.Employment_Location,
+        t.Bank_Name, t.Bank_Account_Title, t.Bank_Account_Number_IBAN,
+        t.Swift_Code_BIC, t.Comments_by_Aun
+    FROM `{staging_ref}` t
+    LEFT JOIN ({_EMPLOYEES_BY_NAME_SQL}) n
+      ON n.Full_Name = t.Employee_Name
+    LEFT JOIN ({_EMPLOYEES_BY_EMAIL_SQL}) m
+      ON m.Official_Email = t.Official_Email
+    """
+    
+    inserted = run_staged_insert(bigquery_client, staging_ref, insert_sql)
+    print(f"Successfully inserted {inserted} new hire records!")
+
+def import_leavers(csv_path: str, month: Optional[str] = None):
+    """Import leavers from CSV file."""
+    bigquery_client = get_bigquery_client()
+    table_ref = f"{PROJECT_ID}.{DATASET_ID}.Pay_Template_Leavers"
+    
+    staging_ref = f"{table_ref}_staging"
+    
+    print(f"\nReading leavers from: {csv_path}")
+    
+    rows = read_template_csv(csv_path)
+
+    def generate_records():
+        for row in rows:
+            # Extract month from Employment End Date if not provided
+            employment_end_date = row.get('Employment End Date', '').strip()
+            record_month = month or extract_month_from_date(employment_end_date)
+
+            if not record_month:
+                print(f"Warning: Could not extract month from Employment End Date: {employment_end_date}")
+                continue
+
+            # Missing Employee IDs are resolved server-side by the INSERT join
+            employee_id = row.get('Employee ID', '').strip()
+
+            # Parse date
+            parsed_date = parse_date(employment_end_date)
+
+            record = LeaverRecord(
+                Type='Leaver',
+                Month=record_month,
+                Employee_ID=employee_id or None,
+                Employee_Name=row.get('Employee Name', '').strip(),
+                Employment_End_Date=parsed_date,
+                Payroll_Type=row.get('Payroll type', 'PKR').strip(),
+                Comments=row.get('Comments', '').strip() or None,
+                Devices_Returned=row.get('Devices Returned?', '').strip() or None,
+                Comments_by_Aun=row.get('Comments by Aun', '').strip() or None,
+            )
+
+            yield record
+
+    # Stage the normalized rows, then resolve IDs and insert in one query
+    print(f"\nLoading records into staging table {staging_ref}...")
+    
+    errors, staged = load_to_staging(bigquery_client, staging_ref, table_ref, generate_records())
+    
+    print(f"Processed {staged} leaver records")
+    
+    if errors:
+        print(f"Errors occurred: {errors}")
+        return
+    if not staged:
+        print("No records to insert.")
+        return
+    
+    insert_sql = f"""
+    INSERT INTO `{table_ref}` (
+        Type, Month, Employee_ID, Employee_Name, Employment_End_Date,
+        Payroll_Type, Comments, Devices_Returned, Comments_by_Aun
+    )
+    SELECT
+        t.Type, t.Month,
+        COALESCE(t.Employee_ID, CAST(n.Employee_ID AS STRING)) AS Employee_ID,
+        t.Employee_Name, t.Employment_End_Date, t.Payroll_Type,
+        t.Comments, t.Devices_Returned, t.Comments_by_Aun
+    FROM `{staging_ref}` t
+    LEFT JOIN ({_EMPLOYEES_BY_NAME_SQL}) n
+      ON n.Full_Name = t.Employee_Name
+    """
+    
+    inserted = run_staged_insert(bigquery_client, staging_ref, insert_sql)
+    print(f"Successfully inserted {inserted} leaver records!")
+
+def import_increments(csv_path: str, month: Optional[str] = None):
+    """Import increments from CSV file."""
+    bigquery_client = get_bigquery_client()
+    table_ref = f"{PROJECT_ID}.{DATASET_ID}.Pay_Template_Increments"
+    staging_ref = f"{table_ref}_staging"
+    
+    print(f"\nReading increments from: {csv_path}")
+    
+    rows = read_template_csv(csv_path)
+
+    def generate_records():
+        for row in rows:
+            # Extract month from Effective date if not provided
+            effective_date = row.get('Effective date', '').strip()
+            record_month = month or extract_month_from_date(effective_date)
+
+            if not record_month:
+                print(f"Warning: Could not extract month from Effective date: {effective_date}")
+                continue
+
+            # Missing Employee IDs and Previous Salaries are resolved
+            # server-side by the INSERT joins
+            employee_id = row.get('Employee ID', '').strip()
+            previous_salary = clean_numeric(row.get('Previous Salary', ''))
+
+            # Parse date
+            parsed_date = parse_date(effective_date)
+
+            record = IncrementRecord(
+                Type='Increment',
+                Month=record_month,
+                Employee_ID=employee_id or None,
+                Employee_Name=row.get('Employee Name', '').strip(),
+                Currency=row.get('Currency', 'PKR').strip(),
+                Previous_Salary=previous_salary,
+                Updated_Salary=clean_numeric(row.get('Updated Salary', 0)),
+                Effective_Date=parsed_date,
+                Comments=row.get('Comments', '').strip() or None,
+                Remarks=row.get('Remarks', '').strip() or None,
+            )
+
+            yield record
+
+    # Stage the normalized rows, then resolve IDs and salaries in one query
+    print(f"\nLoading records into staging table {staging_ref}...")
+    
+    errors, staged = load_to_staging(bigquery_client, staging_ref, table_ref, generate_records())
+    
+    print(f"Processed {staged} increment records")
+    
+    if errors:
+        print(f"Errors occurred: {errors}")
+        return
+    if not staged:
+        print("No records to insert.")
+        return
+    
+    insert_sql = f"""
+    INSERT INTO `{table_ref}` (
+        Type, Month, Employee_ID, Employee_Name, Currency, Previous_Salary,
+        Updated_Salary, Effective_Date, Comments, Remarks
+    )
+    WITH resolved AS (
+        SELECT
+            t.*,
+            COALESCE(t.Employee_ID, CAST(n.Employee_ID AS STRING)) AS Resolved_Employee_ID
+        FROM `{staging_ref}` t
+        LEFT JOIN ({_EMPLOYEES_BY_NAME_SQL}) n
+          ON n.Full_Name = t.Employee_Name
+    ),
+    latest_salary AS (
+        SELECT Employee_ID, Currency, Gross_Income,
+               ROW_NUMBER() OVER (
+                   PARTITION BY Employee_ID, Currency
+                   ORDER BY Payroll_Month DESC
+               ) AS rn
+        FROM {SALARIES_TABLE_REF}
+    )
+    SELECT
+        r.Type, r.Month, r.Resolved_Employee_ID, r.Employee_Name, r.Currency,
+        COALESCE(r.Previous_Salary, s.Gross_Income, e.Gross_Salary) AS Previous_Salary,
+        r.Updated_Salary, r.Effective_Date, r.Comments, r.Remarks
+    FROM resolved r
+    LEFT JOIN latest_salary s
+      ON s.Employee_ID = SAFE_CAST(r.Resolved_Employee_ID AS INT64)
+         AND s.Currency = r.Currency
+         AND s.rn = 1
+    LEFT JOIN {EMPLOYEES_TABLE_REF} e
+      ON e.Employee_ID = SAFE_CAST(r.Resolved_Employee_ID AS INT64)
+    """
+    
+    inserted = run_staged_insert(bigquery_client, staging_ref, insert_sql)
+    print(f"Successfully inserted {inserted} increment records!")
+
+def main():
+    if len(sys.argv) < 3:
+        print("Usage: python scripts/import_pay_template_data.py <type> <csv_file_path> [month]")
+        print("  type: 'new-hires', 'leavers', or 'increments'")
+        print("  csv_file_path: Path to CSV file")
+        print("  month: Optional YYYY-MM format (will be extracted from dates if not provided)")
+        sys.exit(1)
+    
+    import_type = sys.argv[1].lower()
+    csv_path = sys.argv[2]
+    month = sys.argv[3] if len(sys.argv) > 3 else None
+    
+    if not os.path.exists(csv_path):
+        print(f"Error: CSV file not found: {csv_path}")
+        sys.exit(1)
+    
+    print("=" * 80)
+    print("PAY TEMPLATE DATA IMPORT")
+    print("=" * 80)
+    print(f"Type: {import_type}")
+    print(f"CSV File: {csv_path}")
+    print(f"Month: {month or '(will be extracted from dates)'}")
+    print("=" * 80)
+    
+    if import_type == "new-hires":
+        import_new_hires(csv_path, month)
+    elif import_type == "leavers":
+        import_leavers(csv_path, month)
+    elif import_type == "increments":
+        import_increments(csv_path, month)
+    else:
+        print(f"Error: Unknown type '{import_type}'. Must be 'new-hires', 'leavers', or 'increments'")
+        sys.exit(1)
+    
+    print("\n" + "=" * 80)
+    print("IMPORT COMPLETED")
+    print("=" * 80)
+
+if __name__ == "__main__":
+    main()
@@ -1,444 +1,408 @@
-#!/usr/bin/env python3
-"""
-Import Historical Salary Data from CSV Files to Employee_Salaries Table
-========================================================================
-Imports data from:
-- Salaries Combined-USD.csv
-- Salaries Combined-PKR.csv
-
-This script maps all CSV columns to Employee_Salaries schema including:
-- Month Key, Key, Status
-- Email, Date of Joining, Date of Leaving
-- Last Month Salary, Increment data
-- All salary components and calculations
-- PKR-specific fields (prorated allowances, tax, EOBI, etc.)
-
-Prerequisites:
-    - CSV files in project root directory
-    - BigQuery Employee_Salaries table must exist
-    - Employees table must exist (for Employee_ID validation)
-    - Google Cloud credentials configured
-
-Usage:
-    python3 scripts/import_salary_csvs_to_bigquery.py
-
-Author: AI Assistant
-Date: January 2025
-"""
-
-import pandas as pd
-import numpy as np
-from datetime import datetime
-import warnings
-import os
-import sys
-import re
-
-warnings.filterwarnings('ignore')
-
-try:
-    from google.cloud import bigquery
-    from google.oauth2 import service_account
-except ImportError:
-    print("ERROR: Required libraries not installed")
-    print("Please run: pip install google-cloud-bigquery pandas pyarrow")
-    sys.exit(1)
-
-# Configuration
-PROJECT_ID = os.getenv("GCP_PROJECT_ID", "test-imagine-web")
-DATASET_ID = os.getenv("BQ_DATASET", "Vyro_Business_Paradox")
-EMPLOYEES_TABLE = f"{PROJECT_ID}.{DATASET_ID}.Employees"
-TARGET_TABLE = f"{PROJECT_ID}.{DATASET_ID}.Employee_Salaries"
-
-# CSV file paths (relative to script location)
-SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
-USD_CSV = os.path.join(PROJECT_ROOT, "Salaries Combined-USD.csv")
-PKR_CSV = os.path.join(PROJECT_ROOT, "Salaries Combined-PKR.csv")
-
-# Set credentials path
-CREDENTIALS_PATH = os.getenv(
-    "GOOGLE_APPLICATION_CREDENTIALS",
-    os.path.join(PROJECT_ROOT, "Credentials", "test-imagine-web-18d4f9a43aef.json")
-)
-
-def get_bigquery_client():
-    """Initialize BigQuery client."""
-    if os.path.exists(CREDENTIALS_PATH):
-        credentials = service_account.Credentials.from_service_account_file(
-            CREDENTIALS_PATH,
-            scopes=["https://www.googleapis.com/auth/bigquery"],
-        )
-        return bigquery.Client(credentials=credentials, project=PROJECT_ID)
-    else:
-        return bigquery.Client(project=PROJECT_ID)
-
-def log(message):
-    """Print timestamped log message"""
-    timestamp = datetime.now().strftime("%H:%M:%S")
-    print(f"[{timestamp}] {message}")
-
-def clean_numeric_string(value):
-    """Clean numeric strings with commas and convert to float"""
-    if pd.isna(value) or value == '' or value == '-' or str(value).strip() == '':
-        return None
-    if isinstance(value, (int, float)):
-        return float(value)
-    cleaned = str(value).replace(',', '').replace(' ', '').strip()
-    if cleaned == '' or cleaned == '-' or cleaned.lower() == 'nan':
-        return None
-    try:
-        return float(cleaned)
-    except (ValueError, TypeError):
-        return None
-
-def parse_date(value):
-    """Parse various date formats from CSV"""
-    if pd.isna(value) or value == '' or str(value).strip() == '':
-        return None
-    
-    value_str = str(value).strip()
-    
-    # Try parsing common formats
-    formats = [
-        '%d-%b-%y',  # 25-Sep-23
-        '%d-%b-%Y',  # 25-Sep-2023
-        '%Y-%m-%d',  # 2023-09-25
-        '%d/%m/%Y',  # 25/09/2023
-        '%m/%d/%Y',  # 09/25/2023
-    ]
-    
-    for fmt in formats:
-        try:
-            return datetime.strptime(value_str, fmt).date()
-        except ValueError:
-            continue
-    
-    # Try parsing "1 Jan" format
-    try:
-        day, month = value_str.split()
-        month_map = {
-            'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
-            'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
-        }
-        if month.lower() in month_map:
-            return datetime(2025, month_map[month.lower()], int(day)).date()
-    except:
-        pass
-    
-    return None
-
-def parse_month_to_date(month_str):
-    """Convert month string (Jan, Feb, etc.) to first day of month date"""
-    if pd.isna(month_str) or month_str == '' or month_str == 'Month':
-        return None
-    
-    month_map = {
-        'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6, 'june': 6,
-        'jul': 7, 'july': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
-    }
-    
-    month_lower = str(month_str).lower().strip()
-    if month_lower in month_map:
-        year = 2025
-        return datetime(year, month_map[month_lower], 1).date()
-    
-    return None
-
-def clean_employee_id(value):
-    """Clean and convert to numeric Employee_ID"""
-    if pd.isna(value) or value == '':
-        return None
-    if isinstance(value, (int, float)):
-        return int(value)
-    try:
-        return int(float(str(value).replace(',', '').strip()))
-    except (ValueError, TypeError):
-        return None
-
-def import_usd_csv(client):
-    """Import USD salary data from CSV"""
-    log(f"\nLoading USD CSV: {USD_CSV}...")
-    
-    if not os.path.exists(USD_CSV):
-        log(f"ERROR: USD CSV file not found: {USD_CSV}")
-        return []
-    
-    df = pd.read_csv(USD_CSV)
-    log(f"Loaded {len(df)} rows from USD CSV")
-    
-    records = []
-    max_salary_id = 0
-    
-    # Get max Salary_ID from existing data
-    try:
-        query = f"SELECT MAX(Salary_ID) as max_id FROM `{TARGET_TABLE}`"
-        result = client.query(query).result()
-        for row in result:
-            max_salary_id = row.max_id or 0
-    except Exception as e:
-        log(f"Could not get max Salary_ID: {e}")
-    
-    salary_id_counter = max_salary_id + 1
-    
-    for idx, row in df.iterrows():
-        try:
-            employee_id = clean_employee_id(row.get('Employee ID'))
-            if not employee_id:
-                continue
-            
-            month_str = row.get('Month', '')
-            payroll_month = parse_month_to_date(month_str)
-            if not payroll_month:
-                continue
-            
-            # Parse dates
-            joining_date = parse_date(row.get('Date of Joining'))
-            leaving_date = parse_date(row.get('Date of Leaving'))
-            increment_date = parse_date(row.get('Date of Increment/ Decrement'))
-            
-            # Parse numeric values
-            regular_pay = clean_numeric_string(row.get('Regular Pay'))
-            prorated_pay = clean_numeric_string(row.get('Prorated Pay'))
-            performance_bonus = clean_numeric_string(row.get('Performance Bonus'))
-            paid_overtime = clean_numeric_string(row.get(' Paid Overtime '))
-            reimbursements = clean_numeric_string(row.get('Reimbursements'))
-            other = clean_numeric_string(row.get(' Other '))
-            gross_income = clean_numeric_string(row.get('Gross Income'))
-            unpaid_leaves = clean_numeric_string(row.get('Unpaid Leaves'))
-            deductions = clean_numeric_string(row.get('Deductions'))
-            net_income = clean_numeric_string(row.get(' Net Income '))
-            worked_days = clean_numeric_string(row.get('Worked Days'))
-            last_month_salary = clean_numeric_string(row.get('Dec Salary'))
-            increment_amount = clean_numeric_string(row.get('New Addition/Increment/Decrement'))
-            payable_from_last = clean_numeric_string(row.get('Payable from Last Month'))
-            
-            # Calculate Revised_with_OPD (Regular Pay + 21 for USD, if not in probation)
-            # We'll need to check probation status, but for now use Regular Pay
-            revised_with_opd = regular_pay  # Will be calculated properly later
-            
-            record = {
-                'Salary_ID': salary_id_counter,
-                'Employee_ID': employee_id,
-                'Payroll_Month': payroll_month,
-                'Currency': 'USD',
-                'Month_Key': str(row.get('Month Key', '')),
-                'Key': str(row.get('Key', '')),
-                'Status': str(row.get('Status', '')),
-                'Email': str(row.get('emails', '')),
-                'Date_of_Joining': joining_date,
-                'Date_of_Leaving': leaving_date,
-                'Worked_Days': worked_days,
-                'Last_Month_Salary': last_month_salary,
-                'New_Addition_Increment_Decrement': increment_amount,
-                'Date_of_Increment_Decrement': increment_date,
-                'Payable_from_Last_Month': payable_from_last,
-                'Regular_Pay': regular_pay,
-                'Revised_with_OPD': revised_with_opd,
-                'Prorated_Pay': prorated_pay,
-                'Performance_Bonus': performance_bonus,
-                'Paid_Overtime': paid_overtime,
-                'Reimbursements': reimbursements,
-                'Other': other,
-                'Gross_Income': gross_income,
-                'Unpaid_Leaves': unpaid_leaves,
-                'Deductions': deductions,
-                'Net_Income': net_income,
-                'Comments': str(row.get('Comments', '')) if pd.notna(row.get('Comments')) else None,
-                'Internal_Comments': str(row.get('Internal comments', '')) if pd.notna(row.get('Internal comments')) else None,
-                'Designation_At_Payroll': str(row.get('Designation', '')) if pd.notna(row.get('Designation')) else None,
-                'Month': month_str,
-                'Salary_Status': 'Released' if str(row.get('Status', '')) == '1' else 'HOLD',
-                'PaySlip_Status': 'Not Sent',  # Default
-                'Created_At': datetime.now(),
-            }
-            
-            records.append(record)
-            salary_id_counter += 1
-            
-        except Exception as e:
-            log(f"Error processing USD row {idx}: {e}")
-            continue
-    
-    log(f"Processed {len(records)} USD records")
-    return records
-
-def import_pkr_csv(client):
-    """Import PKR salary data from CSV"""
-    log(f"\nLoading PKR CSV: {PKR_CSV}...")
-    
-    if not os.path.exists(PKR_CSV):
-        log(f"ERROR: PKR CSV file not found: {PKR_CSV}")
-        return []
-    
-    df = pd.read_csv(PKR_CSV)
-    log(f"Loaded {len(df)} rows from PKR CSV")
-    
-    records = []
-    max_salary_id = 0
-    
-    # Get max Salary_ID from existing data
-    try:
-        query = f"SELECT MAX(Salary_ID) as max_id FROM `{TARGET_TABLE}`"
-        result = client.query(query).result()
-        for row in result:
-            max_salary_id = row.max_id or 0
-    except Exception as e:
-        log(f"Could not get max Salary_ID: {e}")
-    
-    salary_id_counter = max_salary_id + 1
-    
-    for idx, row in df.iterrows():
-        try:
-            employee_id = clean_employee_id(row.get('Employee ID'))
-            if not employee_id:
-                continue
-            
-            month_str = row.get('Month', '')
-            payroll_month = parse_month_to_date(month_str)
-            if not payroll_month:
-                continue
-            
-            # Parse dates
-            joining_date = parse_date(row.get('Date of Joining'))
-            leaving_date = parse_date(row.get('Date of Leaving'))
-            increment_date = parse_date(row.get(' Date of Increment '))
-            
-            # Parse numeric values
-            regular_pay = clean_numeric_string(row.get('Regular Pay'))
-            prorated_pay = clean_numeric_string(row.get('Prorated Pay'))
-            prorated_base_pay = clean_numeric_string(row.get('Prorated Base Pay'))
-            prorated_medical = clean_numeric_string(row.get('Prorated Medical Allowance'))
-            prorated_transport = clean_numeric_string(row.get('Prorated Transport Allowance '))
-            prorated_inflation = clean_numeric_string(row.get('Prorated Inflation Allowance '))
-            performance_bonus = clean_numeric_string(row.get('Performance Bonus'))
-            paid_overtime = clean_numeric_string(row.get('Paid Overtime'))
-            reimbursements = clean_numeric_string(row.get('Reimbursements'))
-            other = clean_numeric_string(row.get('Other'))
-            taxable_income = clean_numeric_string(row.get('Taxable Income'))
-            gross_income = clean_numeric_string(row.get('Gross Income'))
-            unpaid_leaves = clean_numeric_string(row.get('Unpaid Leaves/days'))
-            tax_deduction = clean_numeric_string(row.get('Tax deduction'))
-            eobi = clean_numeric_string(row.get('EOBI'))
-            loan_deduction = clean_numeric_string(row.get('Loan deduction'))
-            recoveries = clean_numeric_string(row.get('Recoveries '))
-            deductions = clean_numeric_string(row.get('Deductions'))
-            net_income = clean_numeric_string(row.get('Net Income'))
-            worked_days = clean_numeric_string(row.get('Worked Days'))
-            last_month_salary = clean_numeric_string(row.get("Last Months's Salary"))
-            increment_amount = clean_numeric_string(row.get(' Increment/ New Addition '))
-            payable_from_last = clean_numeric_string(row.get('Payable from Last/Next Month'))
-            
-            record = {
-                'Salary_ID': salary_id_counter,
-                'Employee_ID': employee_id,
-                'Payroll_Month': payroll_month,
-                'Currency': 'PKR',
-                'Month_Key': str(row.get('Month Key', '')),
-                'Key': str(row.get('Key', '')),
-                'Status': str(row.get('Status', '')),
-                'Email': str(row.get('Email address', '')),
-                'Date_of_Joining': joining_date,
-                'Date_of_Leaving': leaving_date,
-                'Worked_Days': worked_days,
-                'Last_Month_Salary': last_month_salary,
-                'New_Addition_Increment_Decrement': increment_amount,
-                'Date_of_Increment_Decrement': increment_date,
-                'Payable_from_Last_Month': payable_from_last,
-                'Regular_Pay': regular_pay,
-                'Prorated_Pay': prorated_pay,
-                'Prorated_Base_Pay': prorated_base_pay,
-                'Prorated_Medical_Allowance': prorated_medical,
-                'Prorated_Transport_Allowance': prorated_transport,
-                'Prorated_Inflation_Allowance': prorated_inflation,
-                'Performance_Bonus': performance_bonus,
-                'Paid_Overtime': paid_overtime,
-                'Reimbursements': reimbursements,
-                'Other': other,
-                'Taxable_Income': taxable_income,
-                'Gross_Income': gross_income,
-                'Unpaid_Leaves': unpaid_leaves,
-                'Tax_Deduction': tax_deduction,
-                'EOBI': eobi,
-                'Loan_Deduction': loan_deduction,
-                'Recoveries': recoveries,
-                'Deductions': deductions,
-                'Net_Income': net_income,
-                'Comments': str(row.get('Comments', '')) if pd.notna(row.get('Comments')) else None,
-                'Internal_Comments': None,  # PKR CSV doesn't have this
-                'Designation_At_Payroll': str(row.get('Designation', '')) if pd.notna(row.get('Designation')) else None,
-                'Month': month_str,
-                'Salary_Status': 'Released' if str(row.get('Status', '')) == '1' else 'HOLD',
-                'PaySlip_Status': 'Not Sent',  # Default
-                'Created_At': datetime.now(),
-            }
-            
-            records.append(record)
-            salary_id_counter += 1
-            
-        except Exception as e:
-            log(f"Error processing PKR row {idx}: {e}")
-            continue
-    
-    log(f"Processed {len(records)} PKR records")
-    return records
-
-def insert_records(client, records):
-    """Insert records into BigQuery"""
-    if not records:
-        log("No records to insert")
-        return 0
-    
-    log(f"\nInserting {len(records)} records into {TARGET_TABLE}...")
-    
-    # Convert to DataFrame
-    df = pd.DataFrame(records)
-    
-    # Remove duplicates based on Employee_ID + Payroll_Month + Currency
-    df = df.drop_duplicates(subset=['Employee_ID', 'Payroll_Month', 'Currency'], keep='first')
-    log(f"After deduplication: {len(df)} records")
-    
-    # Insert into BigQuery
-    try:
-        job_config = bigquery.LoadJobConfig(
-            write_disposition=bigquery.WriteDisposition.WRITE_APPEND,
-            schema_update_options=[bigquery.SchemaUpdateOption.ALLOW_FIELD_ADDITION],
-        )
-        
-        job = client.load_table_from_dataframe(df, TARGET_TABLE, job_config=job_config)
-        job.result()  # Wait for job to complete
-        
-        log(f"✓ Successfully inserted {len(df)} records")
-        return len(df)
-    except Exception as e:
-        log(f"✗ Error inserting records: {e}")
-        return 0
-
-def main():
-    """Main execution function"""
-    log("=" * 60)
-    log("Salary CSV Import Script")
-    log("=" * 60)
-    
-    client = get_bigquery_client()
-    
-    # Import USD data
-    usd_records = import_usd_csv(client)
-    
-    # Import PKR data
-    pkr_records = import_pkr_csv(client)
-    
-    # Combine and insert
-    all_records = usd_records + pkr_records
-    log(f"\nTotal records to insert: {len(all_records)}")
-    
-    if all_records:
-        inserted = insert_records(client, all_records)
-        log(f"\n✓ Import complete: {inserted} records inserted")
-    else:
-        log("\n✗ No records to import")
-    
-    log("=" * 60)
-
-if __name__ == "__main__":
-    main()
+#!/usr/bin/env python3
+"""
+Import Historical Salary Data from CSV Files to Employee_Salaries Table
+========================================================================
+Imports data from:
+- Salaries Combined-USD.csv
+- Salaries Combined-PKR.csv
+
+This script maps all CSV columns to Employee_Salaries schema including:
+- Month Key, Key, Status
+- Email, Date of Joining, Date of Leaving
+- Last Month Salary, Increment data
+- All salary components and calculations
+- PKR-specific fields (prorated allowances, tax, EOBI, etc.)
+
+Prerequisites:
+    - CSV files in project root directory
+    - BigQuery Employee_Salaries table must exist
+    - Employees table must exist (for Employee_ID validation)
+    - Google Cloud credentials configured
+
+Usage:
+    python3 scripts/import_salary_csvs_to_bigquery.py
+
+Author: AI Assistant
+Date: January 2025
+"""
+
+import pandas as pd
+import numpy as np
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+import warnings
+import os
+import sys
+import re
+import tempfile
+
+warnings.filterwarnings('ignore')
+
+try:
+    from google.cloud import bigquery
+    from google.oauth2 import service_account
+    import pyarrow as pa
+    from pyarrow import csv as pacsv
+except ImportError:
+    print("ERROR: Required libraries not installed")
+    print("Please run: pip install google-cloud-bigquery pandas pyarrow")
+    sys.exit(1)
+
+# Configuration
+PROJECT_ID = os.getenv("GCP_PROJECT_ID", "test-imagine-web")
+DATASET_ID = os.getenv("BQ_DATASET", "Vyro_Business_Paradox")
+EMPLOYEES_TABLE = f"{PROJECT_ID}.{DATASET_ID}.Employees"
+TARGET_TABLE = f"{PROJECT_ID}.{DATASET_ID}.Employee_Salaries"
+
+# CSV file paths (relative to script location)
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+USD_CSV = os.path.join(PROJECT_ROOT, "Salaries Combined-USD.csv")
+PKR_CSV = os.path.join(PROJECT_ROOT, "Salaries Combined-PKR.csv")
+
+# Set credentials path
+CREDENTIALS_PATH = os.getenv(
+    "GOOGLE_APPLICATION_CREDENTIALS",
+    os.path.join(PROJECT_ROOT, "Credentials", "test-imagine-web-18d4f9a43aef.json")
+)
+
+def get_bigquery_client():
+    """Initialize BigQuery client."""
+    if os.path.exists(CREDENTIALS_PATH):
+        credentials = service_account.Credentials.from_service_account_file(
+            CREDENTIALS_PATH,
+            scopes=["https://www.googleapis.com/auth/bigquery"],
+        )
+        return bigquery.Client(credentials=credentials, project=PROJECT_ID)
+    else:
+        return bigquery.Client(project=PROJECT_ID)
+
+def log(message):
+    """Print timestamped log message"""
+    timestamp = datetime.now().strftime("%H:%M:%S")
+    print(f"[{timestamp}] {message}")
+
+# Known CSV date formats, tried in order
+DATE_FORMATS = (
+    '%d-%b-%y',  # 25-Sep-23
+    '%d-%b-%Y',  # 25-Sep-2023
+    '%Y-%m-%d',  # 2023-09-25
+    '%d/%m/%Y',  # 25/09/2023
+    '%m/%d/%Y',  # 09/25/2023
+)
+
+MONTH_NUM = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
+}
+
+# The Month column additionally uses a couple of long-form names
+PAYROLL_MONTH_NUM = {**MONTH_NUM, 'june': 6, 'july': 7}
+
+def payroll_month_column(df):
+    """Convert the Month column (Jan, Feb, etc.) to first-of-month dates.
+
+    One lowercase/strip/map pass over the whole column replaces the old
+    per-row parse_month_to_date calls; unknown values (including the
+    stray 'Month' header rows) come out as None.
+    """
+    source = df.get('Month', pd.Series('', index=df.index))
+    month_num = source.astype(str).str.lower().str.strip().map(PAYROLL_MONTH_NUM)
+    parsed = pd.to_datetime(pd.DataFrame({
+        'year': 2025,
+        'month': month_num,
+        'day': 1,
+    }), errors='coerce')
+    return parsed.dt.date.where(parsed.notna(), None)
+
+def employee_id_column(df):
+    """Employee ID column as nullable integers (commas stripped)."""
+    if 'Employee ID' not in df.columns:
+        return pd.Series(np.nan, index=df.index)
+    cleaned = df['Employee ID'].astype(str).str.replace(',', '', regex=False).str.strip()
+    return pd.to_numeric(cleaned, errors='coerce')
+
+def numeric_column(df, name):
+    """Numeric column cleaning: strip commas/spaces, coerce to float."""
+    if name not in df.columns:
+        return pd.Series(np.nan, index=df.index)
+    cleaned = (df[name].astype(str)
+               .str.replace(',', '', regex=False)
+               .str.replace(' ', '', regex=False)
+               .str.strip())
+    return pd.to_numeric(cleaned.replace({'': None, '-': None}), errors='coerce')
+
+def text_column(df, name):
+    """Column as strings, with missing cells as empty strings."""
+    if name not in df.columns:
+        return pd.Series('', index=df.index)
+    return df[name].fillna('').astype(str)
+
+def optional_text_column(df, name):
+    """Column as strings, with missing cells kept as None."""
+    if name not in df.columns:
+        return pd.Series(None, index=df.index, dtype=object)
+    source = df[name]
+    return pd.Series(np.where(source.notna(), source.astype(str), None), index=df.index)
+
+def date_column(df, name):
+    """Parse a date column with one vectorized pass per known format.
+
+    Each format gets a single pd.to_datetime call over the still-unparsed
+    cells instead of up to five strptime attempts per cell; "1 Jan" style
+    values fall back to a regex extract against MONTH_NUM (2025 assumed,
+    as before).
+    """
+    if name not in df.columns:
+        return pd.Series(None, index=df.index, dtype=object)
+    source = df[name].astype(str).str.strip()
+    parsed = pd.Series(pd.NaT, index=df.index, dtype='datetime64[ns]')
+    for fmt in DATE_FORMATS:
+        mask = parsed.isna()
+        if not mask.any():
+            break
+        parsed.loc[mask] = pd.to_datetime(source[mask], format=fmt, errors='coerce')
+    mask = parsed.isna()
+    if mask.any():
+        parts = source[mask].str.extract(r'^(\d+)\s+(\w+)$')
+        fallback = pd.to_datetime(pd.DataFrame({
+            'year': 2025,
+            'month': parts[1].str.lower().map(MONTH_NUM),
+            'day': pd.to_numeric(parts[0], errors='coerce'),
+        }), errors='coerce')
+        parsed.loc[mask] = fallback
+    return parsed.dt.date.where(parsed.notna(), None)
+
+def read_salary_csv(path):
+    """Read a salary CSV with Arrow's multi-threaded reader.
+
+    Arrow tokenizes in parallel and fills contiguous column buffers,
+    unlike the single-threaded pandas C parser, and the memory-mapped
+    source lets the parser read pages straight from the OS cache with
+    no intermediate copy. Converted back to pandas so the downstream
+    column cleaning stays unchanged.
+    """
+    with pa.memory_map(path, 'r') as source:
+        table = pacsv.read_csv(
+            source,
+            read_options=pacsv.ReadOptions(block_size=8 << 20, use_threads=True),
+        )
+    return table.to_pandas()
+
+def get_max_salary_id(client):
+    """Fetch the current MAX(Salary_ID) from the target table."""
+    try:
+        query = f"SELECT MAX(Salary_ID) as max_id FROM `{TARGET_TABLE}`"
+        row = next(iter(client.query(query).result()), None)
+        return (row.max_id if row else 0) or 0
+    except Exception as e:
+        log(f"Could not get max Salary_ID: {e}")
+    return 0
+
+# Output column -> (cleaning kind, source CSV header), one entry per
+# field the importers emit. 'copy' duplicates an already-built output
+# column; 'null' emits a column the CSV doesn't carry.
+USD_COLUMN_SPEC = (
+    ('Month_Key', 'text', 'Month Key'),
+    ('Key', 'text', 'Key'),
+    ('Status', 'text', 'Status'),
+    ('Email', 'text', 'emails'),
+    ('Date_of_Joining', 'date', 'Date of Joining'),
+    ('Date_of_Leaving', 'date', 'Date of Leaving'),
+    ('Worked_Days', 'numeric', 'Worked Days'),
+    ('Last_Month_Salary', 'numeric', 'Dec Salary'),
+    ('New_Addition_Increment_Decrement', 'numeric', 'New Addition/Increment/Decrement'),
+    ('Date_of_Increment_Decrement', 'date', 'Date of Increment/ Decrement'),
+    ('Payable_from_Last_Month', 'numeric', 'Payable from Last Month'),
+    ('Regular_Pay', 'numeric', 'Regular Pay'),
+    # Revised_with_OPD: Regular Pay for now; probation-aware value comes later
+    ('Revised_with_OPD', 'copy', 'Regular_Pay'),
+    ('Prorated_Pay', 'numeric', 'Prorated Pay'),
+    ('Performance_Bonus', 'numeric', 'Performance Bonus'),
+    ('Paid_Overtime', 'numeric', ' Paid Overtime '),
+    ('Reimbursements', 'numeric', 'Reimbursements'),
+    ('Other', 'numeric', ' Other '),
+    ('Gross_Income', 'numeric', 'Gross Income'),
+    ('Unpaid_Leaves', 'numeric', 'Unpaid Leaves'),
+    ('Deductions', 'numeric', 'Deductions'),
+    ('Net_Income', 'numeric', ' Net Income '),
+    ('Comments', 'optional_text', 'Comments'),
+    ('Internal_Comments', 'optional_text', 'Internal comments'),
+    ('Designation_At_Payroll', 'optional_text', 'Designation'),
+)
+
+PKR_COLUMN_SPEC = (
+    ('Month_Key', 'text', 'Month Key'),
+    ('Key', 'text', 'Key'),
+    ('Status', 'text', 'Status'),
+    ('Email', 'text', 'Email address'),
+    ('Date_of_Joining', 'date', 'Date of Joining'),
+    ('Date_of_Leaving', 'date', 'Date of Leaving'),
+    ('Worked_Days', 'numeric', 'Worked Days'),
+    ('Last_Month_Salary', 'numeric', "Last Months's Salary"),
+    ('New_Addition_Increment_Decrement', 'numeric', ' Increment/ New Addition '),
+    ('Date_of_Increment_Decrement', 'date', ' Date of Increment '),
+    ('Payable_from_Last_Month', 'numeric', 'Payable from Last/Next Month'),
+    ('Regular_Pay', 'numeric', 'Regular Pay'),
+    ('Prorated_Pay', 'numeric', 'Prorated Pay'),
+    ('Prorated_Base_Pay', 'numeric', 'Prorated Base Pay'),
+    ('Prorated_Medical_Allowance', 'numeric', 'Prorated Medical Allowance'),
+    ('Prorated_Transport_Allowance', 'numeric', 'Prorated Transport Allowance '),
+    ('Prorated_Inflation_Allowance', 'numeric', 'Prorated Inflation Allowance '),
+    ('Performance_Bonus', 'numeric', 'Performance Bonus'),
+    ('Paid_Overtime', 'numeric', 'Paid Overtime'),
+    ('Reimbursements', 'numeric', 'Reimbursements'),
+    ('Other', 'numeric', 'Other'),
+    ('Taxable_Income', 'numeric', 'Taxable Income'),
+    ('Gross_Income', 'numeric', 'Gross Income'),
+    ('Unpaid_Leaves', 'numeric', 'Unpaid Leaves/days'),
+    ('Tax_Deduction', 'numeric', 'Tax deduction'),
+    ('EOBI', 'numeric', 'EOBI'),
+    ('Loan_Deduction', 'numeric', 'Loan deduction'),
+    ('Recoveries', 'numeric', 'Recoveries '),
+    ('Deductions', 'numeric', 'Deductions'),
+    ('Net_Income', 'numeric', 'Net Income'),
+    ('Comments', 'optional_text', 'Comments'),
+    ('Internal_Comments', 'null', None),  # PKR CSV doesn't have this
+    ('Designation_At_Payroll', 'optional_text', 'Designation'),
+)
+
+_COLUMN_CLEANERS = {
+    'text': text_column,
+    'optional_text': optional_text_column,
+    'numeric': numeric_column,
+    'date': date_column,
+}
+
+def build_records(df, currency, column_spec):
+    """Assemble the output frame for one CSV from its column spec.
+
+    The spec drives one cleaner pass per column, so both CSV shapes run
+    through the same fused pipeline.
+    """
+    # Drop rows without a usable Employee ID or Month, as the row loop did
+    employee_id = employee_id_column(df)
+    payroll_month = payroll_month_column(df)
+    keep = employee_id.notna() & (employee_id != 0) & payroll_month.notna()
+    df = df.loc[keep].reset_index(drop=True)
+    employee_id = employee_id[keep].reset_index(drop=True).astype('int64')
+    payroll_month = payroll_month[keep].reset_index(drop=True)
+    
+    records = pd.DataFrame({
+        'Employee_ID': employee_id,
+        'Payroll_Month': payroll_month,
+        'Currency': currency,
+    })
+    for output_name, kind, source in column_spec:
+        if kind == 'copy':
+            records[output_name] = records[source]
+        elif kind == 'null':
+            records[output_name] = None
+        else:
+            records[output_name] = _COLUMN_CLEANERS[kind](df, source)
+    
+    status = text_column(df, 'Status')
+    records['Month'] = text_column(df, 'Month')
+    records['Salary_Status'] = np.where(status == '1', 'Released', 'HOLD')
+    records['PaySlip_Status'] = 'Not Sent'  # Default
+    records['Created_At'] = datetime.now()
+    return records
+
+def import_salary_csv(path, currency, column_spec):
+    """Import one salary CSV through the shared vectorized pipeline."""
+    log(f"\nLoading {currency} CSV: {path}...")
+    
+    if not os.path.exists(path):
+        log(f"ERROR: {currency} CSV file not found: {path}")
+        return pd.DataFrame()
+    
+    df = read_salary_csv(path)
+    log(f"Loaded {len(df)} rows from {currency} CSV")
+    
+    records = build_records(df, currency, column_spec)
+    log(f"Processed {len(records)} {currency} records")
+    return records
+
+def insert_records(client, df):
+    """Insert records into BigQuery"""
+    if df is None or len(df) == 0:
+        log("No records to insert")
+        return 0
+    
+    log(f"\nInserting {len(df)} records into {TARGET_TABLE}...")
+    
+    # Remove duplicates based on Employee_ID + Payroll_Month + Currency,
+    # comparing int64/int8 keys instead of hashing date and string objects
+    df = df.assign(
+        _pm_i=pd.to_datetime(df['Payroll_Month']).astype('int64'),
+        _cur_i=df['Currency'].map({'USD': 0, 'PKR': 1}).astype('int8'),
+    )
+    df = df.drop_duplicates(subset=['Employee_ID', '_pm_i', '_cur_i'], keep='first')
+    df = df.drop(columns=['_pm_i', '_cur_i'])
+    log(f"After deduplication: {len(df)} records")
+    
+    # Narrow dtypes where it can't lose information: IDs and day counts.
+    # Monetary columns stay float64 — float32 only carries ~7 significant
+    # digits, not enough for PKR amounts in the millions with decimals.
+    df['Employee_ID'] = df['Employee_ID'].astype('int32')
+    for column in ('Worked_Days', 'Unpaid_Leaves'):
+        if column in df.columns:
+            df[column] = df[column].astype('float32')
+    
+    # Spool to a local Parquet file and load that, instead of letting
+    # load_table_from_dataframe hold a second serialized copy in memory
+    try:
+        # Load against the table's own schema rather than letting BigQuery
+        # re-infer types from the Parquet file on every run
+        job_config = bigquery.LoadJobConfig(
+            source_format=bigquery.SourceFormat.PARQUET,
+            write_disposition=bigquery.WriteDisposition.WRITE_APPEND,
+            schema=client.get_table(TARGET_TABLE).schema,
+        )
+        
+        with tempfile.NamedTemporaryFile(suffix='.parquet') as parquet_file:
+            df.to_parquet(parquet_file.name, engine='pyarrow', index=False)
+            job = client.load_table_from_file(parquet_file, TARGET_TABLE, job_config=job_config)
+            job.result()  # Wait for job to complete
+        
+        log(f"✓ Successfully inserted {len(df)} records")
+        return len(df)
+    except Exception as e:
+        log(f"✗ Error inserting records: {e}")
+        return 0
+
+def main():
+    """Main execution function"""
+    log("=" * 60)
+    log("Salary CSV Import Script")
+    log("=" * 60)
+    
+    client = get_bigquery_client()
+    
+    # USD and PKR parsing are independent of each other and of the
+    # MAX(Salary_ID) lookup, so run all three concurrently
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        max_id_future = executor.submit(get_max_salary_id, client)
+        usd_future = executor.submit(import_salary_csv, USD_CSV, 'USD', USD_COLUMN_SPEC)
+        pkr_future = executor.submit(import_salary_csv, PKR_CSV, 'PKR', PKR_COLUMN_SPEC)
+        max_salary_id = max_id_future.result()
+        usd_records = usd_future.result()
+        pkr_records = pkr_future.result()
+    
+    # Combine, assign contiguous Salary_IDs, and insert
+    all_records = pd.concat([usd_records, pkr_records], ignore_index=True)
+    if len(all_records):
+        all_records.insert(0, 'Salary_ID', np.arange(
+            max_salary_id + 1, max_salary_id + 1 + len(all_records), dtype='int64'))
+    log(f"\nTotal records to insert: {len(all_records)}")
+    
+    if len(all_records):
+        inserted = insert_records(client, all_records)
+        log(f"\n✓ Import complete: {inserted} records inserted")
+    else:
+        log("\n✗ No records to import")
+    
+    log("=" * 60)
+
+if __name__ == "__main__":
+    main()
@@ -1,319 +1,292 @@
-#!/usr/bin/env python3
-"""
-Insert missing November 2025 EOBI records.
-Uses INSERT IGNORE pattern to skip actual duplicates.
-
-Usage:
-    python3 scripts/insert_missing_november_eobi.py
-"""
-
-import csv
-import os
-import sys
-from datetime import datetime
-from google.cloud import bigquery
-from google.oauth2 import service_account
-
-PROJECT_ID = os.getenv("GCP_PROJECT_ID", "test-imagine-web")
-DATASET_ID = os.getenv("BQ_DATASET", "Vyro_Business_Paradox")
-EMPLOYEES_TABLE = os.getenv("BQ_TABLE", "Employees")
-EOBI_TABLE = os.getenv("BQ_EOBI_TABLE", "Employee_EOBI")
-CREDENTIALS_PATH = os.getenv("GOOGLE_APPLICATION_CREDENTIALS", "Credentials/test-imagine-web-18d4f9a43aef.json")
-
-def get_bigquery_client():
-    credentials = service_account.Credentials.from_service_account_file(CREDENTIALS_PATH)
-    return bigquery.Client(credentials=credentials, project=PROJECT_ID)
-
-def parse_eobi_date(date_str):
-    if not date_str or date_str.strip() == "":
-        return None
-    try:
-        date_str = date_str.strip()
-        parts = date_str.split("-")
-        if len(parts) == 3:
-            day = parts[0]
-            month_str = parts[1]
-            year_str = parts[2]
-            month_map = {
-                "jan": 1, "january": 1, "feb": 2, "february": 2,
-                "mar": 3, "march": 3, "apr": 4, "april": 4,
-                "may": 5, "jun": 6, "june": 6, "jul": 7, "july": 7,
-                "aug": 8, "august": 8, "sep": 9, "september": 9,
-                "oct": 10, "october": 10, "nov": 11, "november": 11,
-                "dec": 12, "december": 12
-            }
-            month = month_map.get(month_str.lower(), None)
-            if not month:
-                return None
-            year = int(year_str)
-            if year < 50:
-                year = 2000 + year
-            else:
-                year = 1900 + year
-            return f"{year}-{month:02d}-{int(day):02d}"
-    except:
-        return None
-    return None
-
-def read_eobi_csv(file_path):
-    records = []
-    with open(file_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            cleaned_row = {}
-            for key, value in row.items():
-                clean_key = key.split('(')[0].strip()
-                cleaned_row[clean_key] = value.strip() if value else ""
-            records.append(cleaned_row)
-    return records
-
-def match_employee(client, name, cnic):
-    table_ref = f"{PROJECT_ID}.{DATASET_ID}.{EMPLOYEES_TABLE}"
-    if cnic:
-        query = f"SELECT Employee_ID, Full_Name FROM `{table_ref}` WHERE CNIC_ID = @cnic LIMIT 1"
-        job_config = bigquery.QueryJobConfig(query_parameters=[bigquery.ScalarQueryParameter("cnic", "STRING", cnic)])
-        results = client.query(query, job_config=job_config).result()
-        for row in results:
-            return row.Employee_ID, row.Full_Name
-    if name:
-        query = f"SELECT Employee_ID, Full_Name FROM `{table_ref}` WHERE LOWER(TRIM(Full_Name)) = LOWER(TRIM(@name)) LIMIT 1"
-        job_config = bigquery.QueryJobConfig(query_parameters=[bigquery.ScalarQueryParameter("name", "STRING", name)])
-        results = client.query(query, job_config=job_config).result()
-        for row in results:
-            return row.Employee_ID, row.Full_Name
-    return None, None
-
-def get_next_eobi_id(client):
-    eobi_table_ref = f"{PROJECT_ID}.{DATASET_ID}.{EOBI_TABLE}"
-    query = f"SELECT COALESCE(MAX(EOBI_ID), 0) + 1 AS next_id FROM `{eobi_table_ref}`"
-    results = client.query(query).result()
-    for row in results:
-        return row.next_id
-    return 1
-
-def insert_eobi_record_safe(client, employee_id, eobi_data, payroll_month_date):
-    """Insert EOBI record, handling duplicates gracefully."""
-    eobi_table_ref = f"{PROJECT_ID}.{DATASET_ID}.{EOBI_TABLE}"
-    
-    # Use MERGE to insert or update
-    dob = parse_eobi_date(eobi_data.get("DOB", ""))
-    doj = parse_eobi_date(eobi_data.get("DOJ", ""))
-    doe = parse_eobi_date(eobi_data.get("DOE", ""))
-    from_date = parse_eobi_date(eobi_data.get("From_Date", ""))
-    to_date = parse_eobi_date(eobi_data.get("To_Date", ""))
-    
-    try:
-        days_worked = float(eobi_data.get("NO_OF_DAYS_WORKED", "0") or "0")
-    except:
-        days_worked = 0
-    
-    # Use MERGE to handle duplicates
-    query = f"""
-    MERGE `{eobi_table_ref}` AS target
-    USING (
-      SELECT 
-        @employee_id AS Employee_ID,
-        @payroll_month AS Payroll_Month
-    ) AS source
-    ON target.Employee_ID = source.Employee_ID 
-      AND target.Payroll_Month = source.Payroll_Month
-    WHEN NOT MATCHED THEN
-      INSERT (
-        EOBI_ID, Employee_ID, Payroll_Month,
-        EMP_AREA_CODE, EMP_REG_SERIAL_NO, EMP_SUB_AREA_CODE, EMP_SUB_SERIAL_NO,
-        EOBI_NO, DOB, DOJ, DOE, NO_OF_DAYS_WORKED, From_Date, To_Date,
-        Loaded_At, Created_At
-      )
-      VALUES (
-        (SELECT COALESCE(MAX(EOBI_ID), 0) + 1 FROM `{eobi_table_ref}`),
-        @employee_id, @payroll_month,
-        @emp_area_code, @emp_reg_serial_no, @emp_sub_area_code, @emp_sub_serial_no,
-        @eobi_no, @dob, @doj, @doe, @days_worked, @from_date, @to_date,
-        CURRENT_TIMESTAMP(), CURRENT_TIMESTAMP()
-      )
-    """
-    
-    params = [
-        bigquery.ScalarQueryParameter("employee_id", "INT64", employee_id),
-        bigquery.ScalarQueryParameter("payroll_month", "DATE", payroll_month_date),
-        bigquery.ScalarQueryParameter("emp_area_code", "STRING", eobi_data.get("EMP_AREA_CODE", "FAA") or "FAA"),
-        bigquery.ScalarQueryParameter("emp_reg_serial_no", "STRING", eobi_data.get("EMP_REG_SERIAL_NO", "4320") or "4320"),
-        bigquery.ScalarQueryParameter("emp_sub_area_code", "STRING", eobi_data.get("EMP_SUB_AREA_CODE", " ") or " "),
-        bigquery.ScalarQueryParameter("emp_sub_serial_no", "STRING", eobi_data.get("EMP_SUB_SERIAL_NO", "0") or "0"),
-        bigquery.ScalarQueryParameter("eobi_no", "STRING", eobi_data.get("EOBI_NO", "") or ""),
-        bigquery.ScalarQueryParameter("dob", "DATE", dob if dob else None),
-        bigquery.ScalarQueryParameter("doj", "DATE", doj if doj else None),
-        bigquery.ScalarQueryParameter("doe", "DATE", doe if doe else None),
-        bigquery.ScalarQueryParameter("days_worked", "NUMERIC", days_worked),
-        bigquery.ScalarQueryParameter("from_date", "DATE", from_date if from_date else None),
-        bigquery.ScalarQueryParameter("to_date", "DATE", to_date if to_date else None),
-    ]
-    
-    job_config = bigquery.QueryJobConfig(query_parameters=params)
-    try:
-        query_job = client.query(query, job_config=job_config)
-        query_job.result()
-        return True
-    except Exception as e:
-        error_msg = str(e)
-        # MERGE doesn't work well with subqueries in VALUES, let's use simpler approach
-        if "subquery" in error_msg.lower() or "MAX" in error_msg:
-            # Fallback to regular INSERT with error handling
-            return insert_eobi_record_direct(client, employee_id, eobi_data, payroll_month_date)
-        return False
-
-def insert_eobi_record_direct(client, employee_id, eobi_data, payroll_month_date):
-    """Direct insert, will fail on duplicate."""
-    eobi_table_ref = f"{PROJECT_ID}.{DATASET_ID}.{EOBI_TABLE}"
-    eobi_id = get_next_eobi_id(client)
-    
-    dob = parse_eobi_date(eobi_data.get("DOB", ""))
-    doj = parse_eobi_date(eobi_data.get("DOJ", ""))
-    doe = parse_eobi_date(eobi_data.get("DOE", ""))
-    from_date = parse_eobi_date(eobi_data.get("From_Date", ""))
-    to_date = parse_eobi_date(eobi_data.get("To_Date", ""))
-    
-    try:
-        days_worked = float(eobi_data.get("NO_OF_DAYS_WORKED", "0") or "0")
-    except:
-        days_worked = 0
-    
-    query = f"""
-    INSERT INTO `{eobi_table_ref}` (
-        EOBI_ID, Employee_ID, Payroll_Month,
-        EMP_AREA_CODE, EMP_REG_SERIAL_NO, EMP_SUB_AREA_CODE, EMP_SUB_SERIAL_NO,
-        EOBI_NO, DOB, DOJ, DOE, NO_OF_DAYS_WORKED, From_Date, To_Date,
-        Loaded_At, Created_At
-    ) VALUES (
-        @eobi_id, @employee_id, @payroll_month,
-        @emp_area_code, @emp_reg_serial_no, @emp_sub_area_code, @emp_sub_serial_no,
-        @eobi_no, @dob, @doj, @doe, @days_worked, @from_date, @to_date,
-        CURRENT_TIMESTAMP(), CURRENT_TIMESTAMP()
-    )
-    """
-    
-    params = [
-        bigquery.ScalarQueryParameter("eobi_id", "INT64", eobi_id),
-        bigquery.ScalarQueryParameter("employee_id", "INT64", employee_id),
-        bigquery.ScalarQueryParameter("payroll_month", "DATE", payroll_month_date),
-        bigquery.ScalarQueryParameter("emp_area_code", "STRING", eobi_data.get("EMP_AREA_CODE", "FAA") or "FAA"),
-        bigquery.ScalarQueryParameter("emp_reg_serial_no", "STRING", eobi_data.get("EMP_REG_SERIAL_NO", "4320") or "4320"),
-        bigquery.ScalarQueryParameter("emp_sub_area_code", "STRING", eobi_data.get("EMP_SUB_AREA_CODE", " ") or " "),
-        bigquery.ScalarQueryParameter("emp_sub_serial_no", "STRING", eobi_data.get("EMP_SUB_SERIAL_NO", "0") or "0"),
-        bigquery.ScalarQueryParameter("eobi_no", "STRING", eobi_data.get("EOBI_NO", "") or ""),
-        bigquery.ScalarQueryParameter("dob", "DATE", dob if dob else None),
-        bigquery.ScalarQueryParameter("doj", "DATE", doj if doj else None),
-        bigquery.ScalarQueryParameter("doe", "DATE", doe if doe else None),
-        bigquery.ScalarQueryParameter("days_worked", "NUMERIC", days_worked),
-        bigquery.ScalarQueryParameter("from_date", "DATE", from_date if from_date else None),
-        bigquery.ScalarQueryParameter("to_date", "DATE", to_date if to_date else None),
-    ]
-    
-    job_config = bigquery.QueryJobConfig(query_parameters=params)
-    try:
-        query_job = client.query(query, job_config=job_config)
-        query_job.result()
-        return True
-    except Exception as e:
-        error_msg = str(e)
-        if "duplicate" in error_msg.lower() or "already exists" in error_msg.lower():
-            return False  # Actual duplicate
-        # For other errors, return False but don't print (too verbose)
-        return False
-
-def update_employee_eobi(client, employee_id, eobi_data):
-    table_ref = f"{PROJECT_ID}.{DATASET_ID}.{EMPLOYEES_TABLE}"
-    updates = []
-    params = []
-    
-    if eobi_data.get("EOBI_NO"):
-        updates.append("EOBI_Number = @eobi_no")
-        params.append(bigquery.ScalarQueryParameter("eobi_no", "STRING", eobi_data["EOBI_NO"]))
-    if eobi_data.get("DOB"):
-        dob = parse_eobi_date(eobi_data["DOB"])
-        if dob:
-            updates.append("Date_of_Birth = @dob")
-            params.append(bigquery.ScalarQueryParameter("dob", "DATE", dob))
-    if eobi_data.get("DOJ"):
-        doj = parse_eobi_date(eobi_data["DOJ"])
-        if doj:
-            updates.append("Joining_Date = @doj")
-            params.append(bigquery.ScalarQueryParameter("doj", "DATE", doj))
-    if eobi_data.get("CNIC"):
-        updates.append("CNIC_ID = @cnic")
-        params.append(bigquery.ScalarQueryParameter("cnic", "STRING", eobi_data["CNIC"]))
-    
-    if not updates:
-        return False
-    
-    query = f"UPDATE `{table_ref}` SET {', '.join(updates)}, Updated_At = CURRENT_DATETIME() WHERE Employee_ID = @employee_id"
-    params.append(bigquery.ScalarQueryParameter("employee_id", "INT64", employee_id))
-    job_config = bigquery.QueryJobConfig(query_parameters=params)
-    
-    try:
-        query_job = client.query(query, job_config=job_config)
-        query_job.result()
-        return True
-    except:
-        return False
-
-def main():
-    csv_file = "/Users/shahzadvyro/Desktop/Vyro_Business_Paradox/EOBI updated data- AI - To be uploaded November 2025 (1).csv"
-    
-    if not os.path.exists(csv_file):
-        print(f"Error: CSV file not found: {csv_file}")
-        sys.exit(1)
-    
-    print(f"Reading EOBI data from: {csv_file}")
-    eobi_records = read_eobi_csv(csv_file)
-    print(f"Found {len(eobi_records)} records in CSV")
-    
-    payroll_month = "2025-11-01"
-    print(f"Payroll Month: {payroll_month}\n")
-    
-    client = get_bigquery_client()
-    
-    matched = 0
-    updated = 0
-    inserted = 0
-    skipped_duplicates = 0
-    not_found = []
-    
-    for idx, record in enumerate(eobi_records, 1):
-        name = record.get("NAME", "").strip()
-        cnic = record.get("CNIC", "").strip()
-        
-        if not name:
-            continue
-        
-        if idx % 50 == 0:
-            print(f"  Progress: {idx}/{len(eobi_records)} (Inserted: {inserted}, Skipped: {skipped_duplicates})")
-        
-        employee_id, employee_name = match_employee(client, name, cnic)
-        
-        if not employee_id:
-            not_found.append({"name": name, "cnic": cnic})
-            continue
-        
-        matched += 1
-        
-        if insert_eobi_record_direct(client, employee_id, record, payroll_month):
-            inserted += 1
-        else:
-            skipped_duplicates += 1
-        
-        update_employee_eobi(client, employee_id, record)
-        updated += 1
-    
-    print("\n" + "="*60)
-    print("SUMMARY")
-    print("="*60)
-    print(f"Total records: {len(eobi_records)}")
-    print(f"Employees matched: {matched}")
-    print(f"EOBI records inserted: {inserted}")
-    print(f"EOBI records skipped (duplicates): {skipped_duplicates}")
-    print(f"Employees updated: {updated}")
-    print(f"Employees not found: {len(not_found)}")
-
-if __name__ == "__main__":
-    main()
+#!/usr/bin/env python3
+"""
+Insert missing November 2025 EOBI records.
+Uses INSERT IGNORE pattern to skip actual duplicates.
+
+Usage:
+    python3 scripts/insert_missing_november_eobi.py
+"""
+
+import os
+import sys
+from datetime import datetime
+
+import pandas as pd
+from google.cloud import bigquery
+from google.oauth2 import service_account
+
+PROJECT_ID = os.getenv("GCP_PROJECT_ID", "test-imagine-web")
+DATASET_ID = os.getenv("BQ_DATASET", "Vyro_Business_Paradox")
+EMPLOYEES_TABLE = os.getenv("BQ_TABLE", "Employees")
+EOBI_TABLE = os.getenv("BQ_EOBI_TABLE", "Employee_EOBI")
+CREDENTIALS_PATH = os.getenv("GOOGLE_APPLICATION_CREDENTIALS", "Credentials/test-imagine-web-18d4f9a43aef.json")
+
+def get_bigquery_client():
+    credentials = service_account.Credentials.from_service_account_file(CREDENTIALS_PATH)
+    return bigquery.Client(credentials=credentials, project=PROJECT_ID)
+
+_MONTH_MAP = {
+    "jan": 1, "january": 1, "feb": 2, "february": 2,
+    "mar": 3, "march": 3, "apr": 4, "april": 4,
+    "may": 5, "jun": 6, "june": 6, "jul": 7, "july": 7,
+    "aug": 8, "august": 8, "sep": 9, "september": 9,
+    "oct": 10, "october": 10, "nov": 11, "november": 11,
+    "dec": 12, "december": 12
+}
+
+def parse_eobi_date(date_str):
+    if not date_str or date_str.strip() == "":
+        return None
+    try:
+        parts = date_str.strip().split("-")
+        if len(parts) == 3:
+            day, month_str, year_str = parts
+            month = _MONTH_MAP.get(month_str.lower())
+            if not month:
+                return None
+            year = int(year_str)
+            if year < 50:
+                year = 2000 + year
+            else:
+                year = 1900 + year
+            return f"{year}-{month:02d}-{int(day):02d}"
+    except (ValueError, IndexError):
+        return None
+    return None
+
+_DATE_COLUMNS = ("DOB", "DOJ", "DOE", "From_Date", "To_Date")
+
+def read_eobi_csv(file_path):
+    """Read the EOBI CSV with pandas and clean it column-wise.
+
+    Date columns are parsed here per unique value instead of per row;
+    EOBI sheets repeat the same handful of dates hundreds of times.
+    parse_eobi_date stays the single parser so the <50 => 2000s
+    two-digit-year pivot is preserved (pandas' %y pivots at 69).
+    """
+    df = pd.read_csv(file_path, dtype=str, keep_default_na=False)
+    # Clean the headers once instead of re-splitting them per row
+    df.columns = [column.split('(')[0].strip() for column in df.columns]
+    df = df.apply(lambda column: column.str.strip())
+    for column in _DATE_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].map({value: parse_eobi_date(value) for value in df[column].unique()})
+    return df.to_dict(orient="records")
+
+def prefetch_employees(client):
+    """Load the Employees table once and index it by CNIC and name.
+
+    One upfront query replaces the one-or-two lookup jobs per CSV row;
+    matching becomes a dict probe.
+    """
+    table_ref = f"{PROJECT_ID}.{DATASET_ID}.{EMPLOYEES_TABLE}"
+    query = f"SELECT Employee_ID, Full_Name, CNIC_ID FROM `{table_ref}`"
+    by_cnic = {}
+    by_name = {}
+    for row in client.query(query).result():
+        if row.CNIC_ID and row.CNIC_ID not in by_cnic:
+            by_cnic[row.CNIC_ID] = (row.Employee_ID, row.Full_Name)
+        if row.Full_Name:
+            name_key = row.Full_Name.strip().lower()
+            if name_key not in by_name:
+                by_name[name_key] = (row.Employee_ID, row.Full_Name)
+    return by_cnic, by_name
+
+def match_employee(by_cnic, by_name, name, cnic):
+    if cnic and cnic in by_cnic:
+        return by_cnic[cnic]
+    if name:
+        found = by_name.get(name.strip().lower())
+        if found:
+            return found
+    return None, None
+
+def get_next_eobi_id(client):
+    eobi_table_ref = f"{PROJECT_ID}.{DATASET_ID}.{EOBI_TABLE}"
+    query = f"SELECT COALESCE(MAX(EOBI_ID), 0) + 1 AS next_id FROM `{eobi_table_ref}`"
+    results = client.query(query).result()
+    for row in results:
+        return row.next_id
+    return 1
+
+def prefetch_existing_eobi(client, payroll_month):
+    """Employee_IDs that already have an EOBI row for this payroll month."""
+    eobi_table_ref = f"{PROJECT_ID}.{DATASET_ID}.{EOBI_TABLE}"
+    query = f"SELECT Employee_ID FROM `{eobi_table_ref}` WHERE Payroll_Month = @payroll_month"
+    job_config = bigquery.QueryJobConfig(query_parameters=[
+        bigquery.ScalarQueryParameter("payroll_month", "DATE", payroll_month),
+    ])
+    return {row.Employee_ID for row in client.query(query, job_config=job_config).result()}
+
+def build_eobi_row(eobi_id, employee_id, eobi_data, payroll_month, loaded_at):
+    """Build one Employee_EOBI row dict for the batch load job.
+
+    Date fields arrive already parsed from read_eobi_csv.
+    """
+    try:
+        days_worked = float(eobi_data.get("NO_OF_DAYS_WORKED", "0") or "0")
+    except (TypeError, ValueError):
+        days_worked = 0
+    
+    return {
+        "EOBI_ID": eobi_id,
+        "Employee_ID": employee_id,
+        "Payroll_Month": payroll_month,
+        "EMP_AREA_CODE": eobi_data.get("EMP_AREA_CODE", "FAA") or "FAA",
+        "EMP_REG_SERIAL_NO": eobi_data.get("EMP_REG_SERIAL_NO", "4320") or "4320",
+        "EMP_SUB_AREA_CODE": eobi_data.get("EMP_SUB_AREA_CODE", " ") or " ",
+        "EMP_SUB_SERIAL_NO": eobi_data.get("EMP_SUB_SERIAL_NO", "0") or "0",
+        "EOBI_NO": eobi_data.get("EOBI_NO", "") or "",
+        "DOB": eobi_data.get("DOB"),
+        "DOJ": eobi_data.get("DOJ"),
+        "DOE": eobi_data.get("DOE"),
+        "NO_OF_DAYS_WORKED": days_worked,
+        "From_Date": eobi_data.get("From_Date"),
+        "To_Date": eobi_data.get("To_Date"),
+        "Loaded_At": loaded_at,
+        "Created_At": loaded_at,
+    }
+
+def insert_eobi_rows(client, rows):
+    """Load all EOBI rows with one batch load job instead of per-row DML."""
+    if not rows:
+        return 0
+    eobi_table_ref = f"{PROJECT_ID}.{DATASET_ID}.{EOBI_TABLE}"
+    job_config = bigquery.LoadJobConfig(
+        write_disposition=bigquery.WriteDisposition.WRITE_APPEND,
+        schema=client.get_table(eobi_table_ref).schema,
+    )
+    client.load_table_from_json(rows, eobi_table_ref, job_config=job_config).result()
+    return len(rows)
+
+def build_employee_update(employee_id, eobi_data):
+    """Build one Employees update row, or None if there is nothing to set."""
+    update = {
+        "Employee_ID": employee_id,
+        "EOBI_Number": eobi_data.get("EOBI_NO") or None,
+        "Date_of_Birth": eobi_data.get("DOB"),
+        "Joining_Date": eobi_data.get("DOJ"),
+        "CNIC_ID": eobi_data.get("CNIC") or None,
+    }
+    if all(value is None for key, value in update.items() if key != "Employee_ID"):
+        return None
+    return update
+
+def apply_employee_updates(client, updates):
+    """Stage all employee updates and apply them with one MERGE.
+
+    Per-row UPDATE jobs are the most expensive DML BigQuery offers;
+    one staging load plus one MERGE replaces N of them. COALESCE keeps
+    the old only-set-present-fields behavior, and last-wins dedup on
+    Employee_ID mirrors sequential per-row updates.
+    """
+    if not updates:
+        return 0
+    updates = list({update["Employee_ID"]: update for update in updates}.values())
+    
+    table_ref = f"{PROJECT_ID}.{DATASET_ID}.{EMPLOYEES_TABLE}"
+    staging_ref = f"{table_ref}_eobi_updates_staging"
+    schema = [
+        bigquery.SchemaField("Employee_ID", "INT64"),
+        bigquery.SchemaField("EOBI_Number", "STRING"),
+        bigquery.SchemaField("Date_of_Birth", "DATE"),
+        bigquery.SchemaField("Joining_Date", "DATE"),
+        bigquery.SchemaField("CNIC_ID", "STRING"),
+    ]
+    job_config = bigquery.LoadJobConfig(
+        write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE,
+        schema=schema,
+    )
+    client.load_table_from_json(updates, staging_ref, job_config=job_config).result()
+    
+    query = f"""
+    MERGE `{table_ref}` AS target
+    USING `{staging_ref}` AS source
+    ON target.Employee_ID = source.Employee_ID
+    WHEN MATCHED THEN UPDATE SET
+        EOBI_Number = COALESCE(source.EOBI_Number, target.EOBI_Number),
+        Date_of_Birth = COALESCE(source.Date_of_Birth, target.Date_of_Birth),
+        Joining_Date = COALESCE(source.Joining_Date, target.Joining_Date),
+        CNIC_ID = COALESCE(source.CNIC_ID, target.CNIC_ID),
+        Updated_At = CURRENT_DATETIME()
+    """
+    try:
+        client.query(query).result()
+    finally:
+        client.delete_table(staging_ref, not_found_ok=True)
+    return len(updates)
+
+def main():
+    csv_file = "/Users/shahzadvyro/Desktop/Vyro_Business_Paradox/EOBI updated data- AI - To be uploaded November 2025 (1).csv"
+    
+    if not os.path.exists(csv_file):
+        print(f"Error: CSV file not found: {csv_file}")
+        sys.exit(1)
+    
+    print(f"Reading EOBI data from: {csv_file}")
+    eobi_records = read_eobi_csv(csv_file)
+    print(f"Found {len(eobi_records)} records in CSV")
+    
+    payroll_month = "2025-11-01"
+    print(f"Payroll Month: {payroll_month}\n")
+    
+    client = get_bigquery_client()
+    
+    print("Prefetching employees for matching...")
+    employees_by_cnic, employees_by_name = prefetch_employees(client)
+    
+    next_eobi_id = get_next_eobi_id(client)
+    existing_eobi = prefetch_existing_eobi(client, payroll_month)
+    print(f"Found {len(existing_eobi)} existing EOBI rows for {payroll_month}")
+    loaded_at = datetime.utcnow().isoformat()
+    rows_to_insert = []
+    employee_updates = []
+    
+    matched = 0
+    skipped_duplicates = 0
+    not_found = []
+    
+    for idx, record in enumerate(eobi_records, 1):
+        name = record.get("NAME", "").strip()
+        cnic = record.get("CNIC", "").strip()
+        
+        if not name:
+            continue
+
+        employee_id, employee_name = match_employee(employees_by_cnic, employees_by_name, name, cnic)
+        
+        if not employee_id:
+            not_found.append({"name": name, "cnic": cnic})
+            continue
+        
+        matched += 1
+        
+        if employee_id in existing_eobi:
+            skipped_duplicates += 1
+        else:
+            existing_eobi.add(employee_id)
+            rows_to_insert.append(build_eobi_row(next_eobi_id, employee_id, record, payroll_month, loaded_at))
+            next_eobi_id += 1
+        
+        employee_update = build_employee_update(employee_id, record)
+        if employee_update:
+            employee_updates.append(employee_update)
+    
+    print(f"\nLoading {len(rows_to_insert)} EOBI rows in one batch job...")
+    inserted = insert_eobi_rows(client, rows_to_insert)
+    
+    print(f"Applying {len(employee_updates)} employee updates with one MERGE...")
+    updated = apply_employee_updates(client, employee_updates)
+    
+    print("\n" + "="*60)
+    print("SUMMARY")
+    print("="*60)
+    print(f"Total records: {len(eobi_records)}")
+    print(f"Employees matched: {matched}")
+    print(f"EOBI records inserted: {inserted}")
+    print(f"EOBI records skipped (duplicates): {skipped_duplicates}")
+    print(f"Employees updated: {updated}")
+    print(f"Employees not found: {len(not_found)}")
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ Helps identify old/unnecessary tables for cleanup.
 """
 
 import os
+import re
 from pathlib import Path
 from google.cloud import bigquery
 from dotenv import load_dotenv
@@ -47,8 +48,11 @@ OLD_TABLE_PATTERNS = [
     "Combined-PKR_2025",
 ]
 
+# One compiled alternation scans each table name in a single C-level pass
+_OLD_RE = re.compile("|".join(map(re.escape, OLD_TABLE_PATTERNS)))
+
 # Current tables (should be kept)
-CURRENT_TABLES = [
+CURRENT_TABLES = frozenset({
     "Employees",
     "Employee_Salaries",
     "Employee_EOBI",
@@ -64,18 +68,29 @@ CURRENT_TABLES = [
     "Access_Platforms",
     "Employee_Device_Assignments",
     "Employee_Access_Grants",
-]
+})
 
 def list_all_tables():
     """List all tables in the dataset with metadata."""
     client = bigquery.Client(project=PROJECT_ID)
-    dataset_ref = client.dataset(DATASET_ID)
     
     print(f"\n{'='*80}")
     print(f"BigQuery Tables in: {PROJECT_ID}.{DATASET_ID}")
     print(f"{'='*80}\n")
     
-    tables = list(client.list_tables(dataset_ref))
+    # One metadata query replaces list_tables plus a get_table round-trip
+    # per table. __TABLES__ is dataset-scoped, so it works regardless of
+    # which region the dataset lives in.
+    query = f"""
+        SELECT
+            table_id,
+            row_count,
+            size_bytes,
+            TIMESTAMP_MILLIS(creation_time) AS created,
+            TIMESTAMP_MILLIS(last_modified_time) AS modified
+        FROM `{PROJECT_ID}.{DATASET_ID}.__TABLES__`
+    """
+    tables = list(client.query(query).result())
     
     if not tables:
         print("No tables found in dataset.")
@@ -88,36 +103,25 @@ def list_all_tables():
     
     for table in tables:
         table_id = table.table_id
-        table_ref = dataset_ref.table(table_id)
         
-        # Get table info
-        try:
-            table_obj = client.get_table(table_ref)
-            num_rows = table_obj.num_rows
-            created = table_obj.created
-            modified = table_obj.modified
-            
-            # Check if it's an old table
-            is_old = any(pattern in table_id for pattern in OLD_TABLE_PATTERNS)
-            is_current = table_id in CURRENT_TABLES
-            
-            table_info = {
-                "id": table_id,
-                "rows": num_rows,
-                "created": created,
-                "modified": modified,
-                "size_mb": table_obj.num_bytes / (1024 * 1024) if table_obj.num_bytes else 0,
-            }
-            
-            if is_old:
-                old_tables.append(table_info)
-            elif is_current:
-                current_tables.append(table_info)
-            else:
-                other_tables.append(table_info)
-                
-        except Exception as e:
-            print(f"Error getting info for {table_id}: {e}")
+        # Check if it's an old table
+        is_old = _OLD_RE.search(table_id) is not None
+        is_current = table_id in CURRENT_TABLES
+        
+        table_info = {
+            "id": table_id,
+            "rows": table.row_count,
+            "created": table.created,
+            "modified": table.modified,
+            "size_mb": table.size_bytes / (1024 * 1024) if table.size_bytes else 0,
+        }
+        
+        if is_old:
+            old_tables.append(table_info)
+        elif is_current:
+            current_tables.append(table_info)
+        else:
+            other_tables.append(table_info)
     
     # Print current tables
     print("✅ CURRENT TABLES (Keep these):")
@@ -24,6 +24,7 @@ import warnings
 warnings.filterwarnings('ignore')
 
 try:
+    from _bq import get_client
     from google.cloud import bigquery
     # Note: Install google-api-python-client if needed: pip install google-api-python-client
     # from google.oauth2 import service_account
@@ -104,7 +105,7 @@ def get_employee_groups(employee_email):
 
 def update_group_info():
     """Update Group_Name and Group_Email in Employees table"""
-    client = bigquery.Client(project=PROJECT_ID)
+    client = get_client()
     
     # Get employees with official emails
     query = f"""
@@ -112,9 +113,11 @@ def update_group_info():
     FROM `{EMPLOYEES_TABLE}`
     WHERE Official_Email IS NOT NULL
     """
-    df_employees = client.query(query).to_dataframe()
+    # Stream the rows directly; only two columns are needed, so there is
+    # no reason to materialize a DataFrame and walk it with iterrows
+    employees = list(client.query(query).result())
     
-    log(f"Found {len(df_employees)} employees with official emails")
+    log(f"Found {len(employees)} employees with official emails")
     
     # Fetch Google groups
     groups = fetch_google_groups()
@@ -126,8 +129,8 @@ def update_group_info():
     # For each employee, find their groups and update
     # This is a simplified version - you may need to query group membership differently
     updates = []
-    for idx, row in df_employees.iterrows():
-        email = str(row['Official_Email']).lower().strip()
+    for row in employees:
+        email = (row.Official_Email or '').lower().strip()
         employee_groups = get_employee_groups(email)
         
         if employee_groups:
@@ -136,7 +139,7 @@ def update_group_info():
             if primary_group and primary_group in groups:
                 group_info = groups[primary_group]
                 updates.append({
-                    'Employee_ID': int(row['Employee_ID']),
+                    'Employee_ID': int(row.Employee_ID),
                     'Group_Name': group_info['name'],
                     'Group_Email': group_info['email']
                 })
@@ -147,21 +150,38 @@ def update_group_info():
     
     log(f"Updating {len(updates)} group assignments...")
     
-    # Update in batches
-    for update in updates:
-        update_query = f"""
-        UPDATE `{EMPLOYEES_TABLE}`
-        SET Group_Name = '{update['Group_Name']}',
-            Group_Email = '{update['Group_Email']}',
-            Updated_At = CURRENT_TIMESTAMP(),
-            Updated_By = 'Google Admin Sync Script'
-        WHERE Employee_ID = {update['Employee_ID']}
-        """
-        try:
-            client.query(update_query).result()
-            log(f"  Updated Employee_ID {update['Employee_ID']}: {update['Group_Name']}")
-        except Exception as e:
-            log(f"  ⚠️  Error updating Employee_ID {update['Employee_ID']}: {e}")
+    # Pass the whole update set as one ARRAY<STRUCT> parameter and apply
+    # it with a single UNNEST MERGE: one job instead of one UPDATE per
+    # employee, and no staging table to load and clean up. Parameters
+    # also keep group names out of the SQL text.
+    rows_param = bigquery.ArrayQueryParameter(
+        "rows",
+        "STRUCT",
+        [
+            bigquery.StructQueryParameter(
+                None,
+                bigquery.ScalarQueryParameter("Employee_ID", "INT64", update["Employee_ID"]),
+                bigquery.ScalarQueryParameter("Group_Name", "STRING", update["Group_Name"]),
+                bigquery.ScalarQueryParameter("Group_Email", "STRING", update["Group_Email"]),
+            )
+            for update in updates
+        ],
+    )
+    merge_query = f"""
+    MERGE `{EMPLOYEES_TABLE}` e
+    USING UNNEST(@rows) r
+    ON e.Employee_ID = r.Employee_ID
+    WHEN MATCHED THEN UPDATE SET
+        Group_Name = r.Group_Name,
+        Group_Email = r.Group_Email,
+        Updated_At = CURRENT_TIMESTAMP(),
+        Updated_By = 'Google Admin Sync Script'
+    """
+    try:
+        client.query(merge_query, job_config=bigquery.QueryJobConfig(query_parameters=[rows_param])).result()
+    except Exception as e:
+        log(f"  ⚠️  Error applying group updates: {e}")
+        return
     
     log(f"✅ Updated {len(updates)} group assignments")
 
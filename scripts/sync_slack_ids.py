@@ -24,6 +24,7 @@ import warnings
 warnings.filterwarnings('ignore')
 
 try:
+    from _bq import get_client
     from google.cloud import bigquery
     # Note: Install slack_sdk if needed: pip install slack_sdk
     # from slack_sdk import WebClient
@@ -56,16 +57,26 @@ def fetch_slack_users():
         return {}
     
     try:
-        # Uncomment when slack_sdk is installed
+        # Uncomment when slack_sdk is installed.
+        # users_list must be paginated: the default page is small and the
+        # endpoint is heavily rate limited, so ask for 1000 per page and
+        # follow the cursor. For delta runs (only employees with a NULL
+        # Slack_ID), prefer users_lookupByEmail per missing address over
+        # walking the whole workspace directory.
         # client = WebClient(token=SLACK_BOT_TOKEN)
-        # response = client.users_list()
         # 
         # slack_users = {}
-        # for user in response['members']:
-        #     email = user.get('profile', {}).get('email', '')
-        #     slack_id = user.get('id', '')
-        #     if email and slack_id:
-        #         slack_users[email.lower()] = slack_id
+        # cursor = None
+        # while True:
+        #     response = client.users_list(limit=1000, cursor=cursor)
+        #     for user in response['members']:
+        #         email = user.get('profile', {}).get('email', '')
+        #         slack_id = user.get('id', '')
+        #         if email and slack_id:
+        #             slack_users[email.lower()] = slack_id
+        #     cursor = response.get('response_metadata', {}).get('next_cursor')
+        #     if not cursor:
+        #         break
         # 
         # log(f"Fetched {len(slack_users)} Slack users")
         # return slack_users
@@ -86,7 +97,7 @@ def update_slack_ids(slack_users):
         log("No Slack users to sync")
         return
     
-    client = bigquery.Client(project=PROJECT_ID)
+    client = get_client()
     
     # Get employees with official emails
     query = f"""
@@ -94,22 +105,25 @@ def update_slack_ids(slack_users):
     FROM `{EMPLOYEES_TABLE}`
     WHERE Official_Email IS NOT NULL
     """
-    df_employees = client.query(query).to_dataframe()
+    # Download via the Storage Read API: columnar Arrow batches instead
+    # of paged JSON rows
+    df_employees = client.query(query).to_dataframe(create_bqstorage_client=True)
     
     log(f"Found {len(df_employees)} employees with official emails")
     
-    # Match and update
-    updates = []
-    for idx, row in df_employees.iterrows():
-        email = str(row['Official_Email']).lower().strip()
-        if email in slack_users:
-            slack_id = slack_users[email]
-            if row['Slack_ID'] != slack_id:
-                updates.append({
-                    'Employee_ID': int(row['Employee_ID']),
-                    'Slack_ID': slack_id,
-                    'Email': email
-                })
+    # Vectorized match: normalize the email column once, map the Slack
+    # directory onto it, and keep only rows whose Slack_ID would change
+    email_norm = df_employees['Official_Email'].astype(str).str.lower().str.strip()
+    new_slack = email_norm.map(slack_users)
+    changed = new_slack.notna() & (new_slack != df_employees['Slack_ID'])
+    updates = [
+        {'Employee_ID': int(employee_id), 'Slack_ID': slack_id, 'Email': email}
+        for employee_id, slack_id, email in zip(
+            df_employees.loc[changed, 'Employee_ID'],
+            new_slack[changed],
+            email_norm[changed],
+        )
+    ]
     
     if not updates:
         log("No Slack IDs to update")
@@ -117,20 +131,36 @@ def update_slack_ids(slack_users):
     
     log(f"Updating {len(updates)} Slack IDs...")
     
-    # Update in batches
-    for update in updates:
-        update_query = f"""
-        UPDATE `{EMPLOYEES_TABLE}`
-        SET Slack_ID = '{update['Slack_ID']}',
-            Updated_At = CURRENT_TIMESTAMP(),
-            Updated_By = 'Slack Sync Script'
-        WHERE Employee_ID = {update['Employee_ID']}
-        """
-        try:
-            client.query(update_query).result()
-            log(f"  Updated {update['Email']}: {update['Slack_ID']}")
-        except Exception as e:
-            log(f"  ⚠️  Error updating {update['Email']}: {e}")
+    # Load the updates into a staging table and apply them with one
+    # MERGE: two jobs total instead of one UPDATE job per employee,
+    # and Slack-sourced IDs stay out of the SQL text.
+    staging_ref = f"{EMPLOYEES_TABLE}__slack_updates_tmp"
+    job_config = bigquery.LoadJobConfig(
+        schema=[
+            bigquery.SchemaField("Employee_ID", "INT64"),
+            bigquery.SchemaField("Slack_ID", "STRING"),
+        ],
+        write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE,
+    )
+    staged = [{'Employee_ID': u['Employee_ID'], 'Slack_ID': u['Slack_ID']} for u in updates]
+    client.load_table_from_json(staged, staging_ref, job_config=job_config).result()
+    
+    merge_query = f"""
+    MERGE `{EMPLOYEES_TABLE}` T
+    USING `{staging_ref}` S
+    ON T.Employee_ID = S.Employee_ID
+    WHEN MATCHED AND (T.Slack_ID IS NULL OR T.Slack_ID != S.Slack_ID) THEN UPDATE SET
+        Slack_ID = S.Slack_ID,
+        Updated_At = CURRENT_TIMESTAMP(),
+        Updated_By = 'Slack Sync Script'
+    """
+    try:
+        client.query(merge_query).result()
+    except Exception as e:
+        log(f"  ⚠️  Error applying Slack ID updates: {e}")
+        return
+    finally:
+        client.delete_table(staging_ref, not_found_ok=True)
     
     log(f"✅ Updated {len(updates)} Slack IDs")
 
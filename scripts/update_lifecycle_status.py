@@ -23,6 +23,9 @@ import warnings
 warnings.filterwarnings('ignore')
 
 try:
+    from _bq import get_client
+    import numpy as np
+    import pandas as pd
     from google.cloud import bigquery
 except ImportError:
     print("ERROR: Required libraries not installed")
@@ -43,78 +46,70 @@ def log(message):
     timestamp = datetime.now().strftime("%H:%M:%S")
     print(f"[{timestamp}] {message}")
 
-def determine_lifecycle_status(row):
-    """Determine lifecycle status based on employee data"""
-    # If employee has Official_Email and Employee_ID, they're at least Email_Created
-    if row.get('Official_Email') and row.get('Employee_ID'):
-        # If Employment_Status is Active, they're fully onboarded
-        if row.get('Employment_Status') == 'Active':
-            return 'Active'
-        elif row.get('Employment_Status') == 'Resigned':
-            return 'Resigned'
-        elif row.get('Employment_Status') == 'Terminated':
-            return 'Terminated'
-        else:
-            return 'Onboarded'
-    
-    # If Employee_ID exists but no email, they're at Employee_ID_Assigned
-    elif row.get('Employee_ID'):
-        return 'Employee_ID_Assigned'
-    
-    # If data exists but no ID, they're at Data_Added
-    elif row.get('Full_Name') or row.get('CNIC_ID'):
-        return 'Data_Added'
-    
-    # Otherwise, Form_Submitted
-    else:
-        return 'Form_Submitted'
-
 def update_lifecycle_statuses():
     """Update lifecycle statuses for all employees"""
     log("="*80)
     log("UPDATE LIFECYCLE STATUSES")
     log("="*80)
     
-    client = bigquery.Client(project=PROJECT_ID)
+    client = get_client()
     
     # Get all employees
     query = f"""
     SELECT 
         Employee_ID,
         Full_Name,
+        CNIC_ID,
         Official_Email,
         Employment_Status,
-        Lifecycle_Status,
-        Timestamp as Form_Submitted_Date
+        Lifecycle_Status
     FROM `{EMPLOYEES_TABLE}`
     WHERE Is_Deleted IS NULL OR Is_Deleted = FALSE
     """
-    df_employees = client.query(query).to_dataframe()
+    # Download via the Storage Read API: columnar Arrow batches instead
+    # of paged JSON rows
+    df_employees = client.query(query).to_dataframe(create_bqstorage_client=True)
     
     log(f"Found {len(df_employees)} employees to check")
     
-    updates = []
-    events_to_create = []
+    # Status ladder as one np.select over boolean masks instead of an
+    # if/elif chain dispatched per row through iterrows + to_dict.
+    # notna() also treats missing values as missing, where the old
+    # truthiness checks let NaN pass as present.
+    has_email = df_employees['Official_Email'].notna() & (df_employees['Official_Email'].astype(str) != '')
+    has_id = df_employees['Employee_ID'].notna()
+    has_name_or_cnic = df_employees['Full_Name'].notna() | df_employees['CNIC_ID'].notna()
+    status = df_employees['Employment_Status']
+    new_statuses = np.select(
+        [
+            has_email & has_id & (status == 'Active'),
+            has_email & has_id & (status == 'Resigned'),
+            has_email & has_id & (status == 'Terminated'),
+            has_email & has_id,
+            has_id,
+            has_name_or_cnic,
+        ],
+        ['Active', 'Resigned', 'Terminated', 'Onboarded', 'Employee_ID_Assigned', 'Data_Added'],
+        default='Form_Submitted',
+    )
+    df_employees['New_Status'] = new_statuses
+    changed = df_employees.loc[
+        df_employees['Lifecycle_Status'] != df_employees['New_Status'],
+        ['Employee_ID', 'Lifecycle_Status', 'New_Status'],
+    ].copy()
+    changed['Employee_ID'] = changed['Employee_ID'].astype(int)
+    
+    # Build both lists straight from the changed frame - no per-row loop
+    updates = changed.rename(columns={'Lifecycle_Status': 'Old_Status'}).to_dict('records')
     
-    for idx, row in df_employees.iterrows():
-        current_status = row.get('Lifecycle_Status')
-        new_status = determine_lifecycle_status(row.to_dict())
-        
-        if current_status != new_status:
-            updates.append({
-                'Employee_ID': int(row['Employee_ID']),
-                'Old_Status': current_status,
-                'New_Status': new_status
-            })
-            
-            # Create lifecycle event
-            events_to_create.append({
-                'Employee_ID': int(row['Employee_ID']),
-                'Lifecycle_Status': new_status,
-                'Event_Date': datetime.now(),
-                'Event_By': 'Lifecycle Status Automation',
-                'Notes': f'Automated update from {current_status} to {new_status}'
-            })
+    event_date = datetime.now()
+    events_to_create = pd.DataFrame({
+        'Employee_ID': changed['Employee_ID'],
+        'Lifecycle_Status': changed['New_Status'],
+        'Event_Date': event_date,
+        'Event_By': 'Lifecycle Status Automation',
+        'Notes': 'Automated update from ' + changed['Lifecycle_Status'].astype(str) + ' to ' + changed['New_Status'],
+    }).to_dict('records')
     
     if not updates:
         log("No lifecycle status updates needed")
@@ -122,26 +117,54 @@ def update_lifecycle_statuses():
     
     log(f"Updating {len(updates)} lifecycle statuses...")
     
-    # Update Employees table
-    for update in updates:
-        update_query = f"""
-        UPDATE `{EMPLOYEES_TABLE}`
-        SET Lifecycle_Status = '{update['New_Status']}',
-            Updated_At = CURRENT_TIMESTAMP(),
-            Updated_By = 'Lifecycle Status Automation'
-        WHERE Employee_ID = {update['Employee_ID']}
-        """
-        try:
-            client.query(update_query).result()
-            log(f"  Updated Employee_ID {update['Employee_ID']}: {update['Old_Status']} → {update['New_Status']}")
-        except Exception as e:
-            log(f"  ⚠️  Error updating Employee_ID {update['Employee_ID']}: {e}")
+    # Stage the status changes and apply them with one MERGE: two jobs
+    # total instead of one UPDATE per employee, which both serialized N
+    # round-trips and risked BigQuery's per-table DML rate limits.
+    staging_ref = f"{EMPLOYEES_TABLE}__lifecycle_updates_tmp"
+    job_config = bigquery.LoadJobConfig(
+        schema=[
+            bigquery.SchemaField("Employee_ID", "INT64"),
+            bigquery.SchemaField("New_Status", "STRING"),
+        ],
+        write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE,
+    )
+    staged = [{'Employee_ID': u['Employee_ID'], 'New_Status': u['New_Status']} for u in updates]
+    client.load_table_from_json(staged, staging_ref, job_config=job_config).result()
+    
+    merge_query = f"""
+    MERGE `{EMPLOYEES_TABLE}` T
+    USING `{staging_ref}` S
+    ON T.Employee_ID = S.Employee_ID
+    WHEN MATCHED AND (T.Lifecycle_Status IS NULL OR T.Lifecycle_Status != S.New_Status) THEN UPDATE SET
+        Lifecycle_Status = S.New_Status,
+        Updated_At = CURRENT_TIMESTAMP(),
+        Updated_By = 'Lifecycle Status Automation'
+    """
+    try:
+        client.query(merge_query).result()
+    except Exception as e:
+        log(f"  ⚠️  Error applying lifecycle status updates: {e}")
+        return
+    finally:
+        client.delete_table(staging_ref, not_found_ok=True)
     
-    # Create lifecycle events
+    # Create lifecycle events with one batch load job
     if events_to_create:
         log(f"Creating {len(events_to_create)} lifecycle events...")
-        # Note: You'll need to insert events into Employee_Lifecycle_Events table
-        # This requires generating Event_IDs - implement based on your needs
+        try:
+            next_id_query = f"SELECT COALESCE(MAX(Event_ID), 0) + 1 AS next_id FROM `{LIFECYCLE_EVENTS_TABLE}`"
+            next_event_id = next(iter(client.query(next_id_query).result())).next_id
+            for offset, event in enumerate(events_to_create):
+                event['Event_ID'] = next_event_id + offset
+                event['Event_Date'] = event['Event_Date'].isoformat()
+            events_config = bigquery.LoadJobConfig(
+                write_disposition=bigquery.WriteDisposition.WRITE_APPEND,
+                schema=client.get_table(LIFECYCLE_EVENTS_TABLE).schema,
+            )
+            client.load_table_from_json(events_to_create, LIFECYCLE_EVENTS_TABLE, job_config=events_config).result()
+            log(f"✅ Created {len(events_to_create)} lifecycle events")
+        except Exception as e:
+            log(f"  ⚠️  Error creating lifecycle events: {e}")
     
     log(f"✅ Updated {len(updates)} lifecycle statuses")
 
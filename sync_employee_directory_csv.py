@@ -26,17 +26,27 @@ Date: 18-Nov-2025
 from __future__ import annotations
 
 import argparse
+import hashlib
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from collections import defaultdict
 import json
 from pathlib import Path
 from typing import Optional
 
+import numpy as np
 import pandas as pd
 from google.cloud import bigquery
 
 BASE_DIR = Path(__file__).resolve().parent
+
+import sys
+
+sys.path.insert(0, str(BASE_DIR / "scripts"))
+
+from _bq import get_client
+
 CSV_PATH = BASE_DIR / "Employee Directory __ Vyro - V1 - Employees Data.csv"
 SCHEMA_MAP_PATH = BASE_DIR / "EmployeeData" / "employee_directory_column_map.json"
 
@@ -44,6 +54,7 @@ PROJECT_ID = os.environ.get("GCP_PROJECT_ID", "test-imagine-web")
 DATASET_ID = os.environ.get("BQ_DATASET", "Vyro_Business_Paradox")
 LATEST_TABLE = os.environ.get("BQ_DIRECTORY_TABLE", "EmployeeDirectoryLatest_v1")
 HISTORY_TABLE = os.environ.get("BQ_HISTORY_TABLE", "EmployeeDirectoryHistory_v1")
+STATE_TABLE = os.environ.get("BQ_SYNC_STATE_TABLE", "_sync_state")
 
 
 STATUS_MAP = {
@@ -74,24 +85,6 @@ class Config:
         return f"{self.project_id}.{self.dataset_id}.{self.history_table}"
 
 
-def normalise_status(value: Optional[str]) -> str:
-    if not value or str(value).strip() == "":
-        return "Active"
-    key = str(value).strip().lower()
-    return STATUS_MAP.get(key, "Active" if "active" in key else "Resigned/Terminated")
-
-
-def clean_employee_id(value) -> str:
-    if pd.isna(value):
-        return ""
-    text = str(value).strip()
-    if not text:
-        return ""
-    if text.endswith(".0"):
-        text = text[:-2]
-    return text
-
-
 def parse_join_date(value):
     if pd.isna(value) or value == "":
         return pd.NaT
@@ -107,51 +100,58 @@ DATE_COLUMNS = [
 ]
 
 
+_UNDERSCORE_RE = re.compile(r"[ /\-.]")
+_STRIP_RE = re.compile(r"\W+")
+_DEDUP_RE = re.compile(r"_{2,}")
+
+
 def sanitize_column(name: str) -> str:
-    sanitized = name.strip()
-    replacements = {
-        " ": "_",
-        "/": "_",
-        "-": "_",
-        "(": "",
-        ")": "",
-        ".": "_",
-        "&": "and",
-    }
-    for old, new in replacements.items():
-        sanitized = sanitized.replace(old, new)
-    sanitized = "".join(ch for ch in sanitized if ch.isalnum() or ch == "_")
-    while "__" in sanitized:
-        sanitized = sanitized.replace("__", "_")
+    sanitized = name.strip().replace("&", "and")
+    sanitized = _UNDERSCORE_RE.sub("_", sanitized)
+    sanitized = _STRIP_RE.sub("", sanitized)
+    sanitized = _DEDUP_RE.sub("_", sanitized)
     if sanitized and sanitized[0].isdigit():
         sanitized = f"C_{sanitized}"
     return sanitized or "Column"
 
 
 def build_column_mapping(columns: list[str]) -> dict[str, str]:
+    sanitized = [sanitize_column(col) for col in columns]
+    seen: dict[str, int] = {}
     mapping: dict[str, str] = {}
-    usage: defaultdict[str, int] = defaultdict(int)
-    for col in columns:
-        base = sanitize_column(col)
-        usage[base] += 1
-        candidate = base if usage[base] == 1 else f"{base}_{usage[base]}"
-        mapping[col] = candidate
+    for col, base in zip(columns, sanitized):
+        seen[base] = seen.get(base, 0) + 1
+        mapping[col] = base if seen[base] == 1 else f"{base}_{seen[base]}"
     return mapping
 
 
-def add_iso_columns(df: pd.DataFrame, column_mapping: dict[str, str]) -> None:
+def add_iso_columns(df: pd.DataFrame, column_mapping: dict[str, str]) -> dict[str, pd.Series]:
+    """Add the *_ISO text columns and return the parsed datetime series.
+
+    Each date column is decoded exactly once; callers that need the
+    datetimes again (the re-join ordering) reuse the returned series
+    instead of re-running pd.to_datetime.
+    """
+    parsed_dates: dict[str, pd.Series] = {}
     for original in DATE_COLUMNS:
         sanitized = column_mapping.get(original)
         if not sanitized or sanitized not in df.columns:
             continue
         iso_col = f"{sanitized}_ISO"
-        df[iso_col] = pd.to_datetime(df[sanitized], errors="coerce").dt.strftime("%Y-%m-%d")
+        # Slice the ISO timestamp text instead of dt.strftime, which
+        # falls back to a per-element Python format call
+        parsed = pd.to_datetime(df[sanitized], errors="coerce")
+        parsed_dates[original] = parsed
+        df[iso_col] = parsed.astype("string").str.slice(0, 10).where(parsed.notna())
+    return parsed_dates
 
 
-def load_csv(path: Path) -> tuple[pd.DataFrame, dict[str, str]]:
+def load_csv(path: Path) -> tuple[pd.DataFrame, dict[str, str], dict[str, pd.Series]]:
     if not path.exists():
         raise FileNotFoundError(f"Source CSV not found: {path}")
-    df = pd.read_csv(path)
+    # pyarrow's multithreaded CSV reader parses the directory export
+    # considerably faster than the default C engine
+    df = pd.read_csv(path, engine="pyarrow")
     column_mapping = build_column_mapping(list(df.columns))
     df = df.rename(columns=column_mapping)
 
@@ -159,63 +159,159 @@ def load_csv(path: Path) -> tuple[pd.DataFrame, dict[str, str]]:
         json.dump({sanitized: original for original, sanitized in column_mapping.items()}, fh, indent=2)
 
     id_col = column_mapping.get("ID", "ID")
-    df[id_col] = df[id_col].apply(clean_employee_id)
-    df["Employee_ID"] = df[id_col]
-    df["Employee_ID"] = df.apply(
-        lambda row: f"TEMP-{int(row.name)+1:04d}" if row["Employee_ID"] == "" else row["Employee_ID"],
-        axis=1,
+    # Vectorized ID cleanup: strip, drop the ".0" float artefact and
+    # backfill missing IDs with deterministic TEMP identifiers — two
+    # column passes instead of two per-row apply loops.
+    ids = df[id_col].astype("string").fillna("").str.strip()
+    ids = ids.mask(ids.str.endswith(".0"), ids.str.slice(0, -2))
+    df[id_col] = ids
+    temp_ids = pd.Series(
+        [f"TEMP-{int(ix) + 1:04d}" for ix in df.index], index=df.index, dtype="string"
     )
+    df["Employee_ID"] = ids.where(ids != "", temp_ids)
 
-    add_iso_columns(df, column_mapping)
+    parsed_dates = add_iso_columns(df, column_mapping)
 
     status_columns = [
         column_mapping.get("Status.1"),
         column_mapping.get("Status"),
     ]
-    status_columns = [col for col in status_columns if col]
-
-    def pick_status(row):
-        for col in status_columns:
-            if col in row and pd.notna(row[col]) and str(row[col]).strip():
-                return row[col]
-        return None
-
-    df["Status_Raw"] = df.apply(pick_status, axis=1)
-    df["Employment_Status"] = df["Status_Raw"].apply(normalise_status)
+    status_columns = [col for col in status_columns if col in df.columns]
+
+    # Coalesce the status candidates column-wise and normalise the whole
+    # column at once instead of two per-row apply passes
+    if status_columns:
+        candidates = df[status_columns].astype("string").replace(r"^\s*$", pd.NA, regex=True)
+        df["Status_Raw"] = candidates.bfill(axis=1).iloc[:, 0]
+    else:
+        df["Status_Raw"] = pd.NA
+    lowered = df["Status_Raw"].astype("string").str.strip().str.lower()
+    mapped = lowered.map(STATUS_MAP)
+    fallback = np.where(lowered.str.contains("active", na=False), "Active", "Resigned/Terminated")
+    df["Employment_Status"] = mapped.where(mapped.notna(), pd.Series(fallback, index=df.index))
+    df.loc[lowered.isna() | (lowered == ""), "Employment_Status"] = "Active"
     df["Record_Source"] = path.name
     name_col = column_mapping.get("Name", "Name")
     df["Full_Name"] = df[name_col]
-    return df, column_mapping
+    return df, column_mapping, parsed_dates
 
 
-def build_history(df: pd.DataFrame, column_mapping: dict[str, str]) -> pd.DataFrame:
+def build_history(
+    df: pd.DataFrame,
+    column_mapping: dict[str, str],
+    parsed_dates: Optional[dict[str, pd.Series]] = None,
+) -> pd.DataFrame:
     join_col = column_mapping.get("Joining Date", column_mapping.get("Joining_Date"))
-    history = df.copy()
-    history["_join_order"] = pd.to_datetime(history[join_col], errors="coerce")
-    history["_join_order"] = history["_join_order"].fillna(pd.Timestamp("1900-01-01"))
-    history = history.sort_values(["Employee_ID", "_join_order", "Employment_Status"])
+    # Work on the caller's frame directly; main() never reuses df after
+    # this call, so the full-frame copy bought nothing but a memory spike
+    history = df
+    # Reuse the join dates parsed in add_iso_columns rather than
+    # decoding the column a second time
+    if parsed_dates and "Joining Date" in parsed_dates:
+        history["_join_order"] = parsed_dates["Joining Date"]
+    else:
+        history["_join_order"] = pd.to_datetime(history[join_col], errors="coerce")
+    # NaT sorts first instead of being materialised as a 1900-01-01 sentinel
+    history = history.sort_values(
+        ["Employee_ID", "_join_order", "Employment_Status"], na_position="first"
+    )
     history["Rejoin_Sequence"] = history.groupby("Employee_ID").cumcount() + 1
-    history["Latest_Sequence"] = history.groupby("Employee_ID")["Rejoin_Sequence"].transform("max")
-    history["Is_Current"] = history["Rejoin_Sequence"] == history["Latest_Sequence"]
-    history["Record_UUID"] = history.apply(lambda row: f"{row.Employee_ID}-{row.Rejoin_Sequence}", axis=1)
+    # On the sorted frame the last row per employee is the current one;
+    # duplicated(keep='last') marks the rest in a single scan
+    history["Is_Current"] = ~history["Employee_ID"].duplicated(keep="last")
+    history["Record_UUID"] = history["Employee_ID"].astype(str) + "-" + history["Rejoin_Sequence"].astype(str)
     history = history.drop(columns=["_join_order"])
     return history
 
 
 def build_latest(history: pd.DataFrame) -> pd.DataFrame:
-    latest = history[history["Is_Current"]].copy()
-    latest = latest.drop(columns=["Record_UUID"])
-    latest = latest.drop(columns=["Is_Current"], errors="ignore")
-    return latest
+    # Boolean indexing already yields a new frame, so drop() on it is
+    # enough - no extra copy of the wide directory frame
+    return history.loc[history["Is_Current"]].drop(columns=["Record_UUID", "Is_Current"], errors="ignore")
+
+
+def categoricalize(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert low-cardinality string columns to category dtype.
+
+    Parquet (the wire format behind load_table_from_dataframe)
+    dictionary-encodes categoricals, so repeated values like statuses
+    and departments serialize once instead of once per row.
+    """
+    for column in df.select_dtypes(include="object").columns:
+        if df[column].nunique(dropna=False) / max(len(df), 1) < 0.5:
+            df[column] = df[column].astype("category")
+    return df
+
+
+def compute_csv_hash(path: Path) -> str:
+    """SHA-256 of the CSV, fed in 1 MB blocks so large files stay cheap."""
+    digest = hashlib.sha256()
+    with path.open("rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def get_last_synced_hash(cfg: Config) -> Optional[str]:
+    client = get_client(cfg.project_id)
+    state_ref = f"{cfg.project_id}.{cfg.dataset_id}.{STATE_TABLE}"
+    query = f"SELECT content_hash FROM `{state_ref}` WHERE table_name = @table_name"
+    job_config = bigquery.QueryJobConfig(query_parameters=[
+        bigquery.ScalarQueryParameter("table_name", "STRING", cfg.latest_table),
+    ])
+    try:
+        row = next(iter(client.query(query, job_config=job_config).result()), None)
+        return row.content_hash if row else None
+    except Exception:
+        # First run, or the state table does not exist yet
+        return None
+
+
+def store_synced_hash(cfg: Config, content_hash: str) -> None:
+    client = get_client(cfg.project_id)
+    state_ref = f"{cfg.project_id}.{cfg.dataset_id}.{STATE_TABLE}"
+    client.query(f"""
+    CREATE TABLE IF NOT EXISTS `{state_ref}` (
+        table_name STRING,
+        content_hash STRING,
+        updated_at TIMESTAMP
+    )
+    """).result()
+    merge_query = f"""
+    MERGE `{state_ref}` T
+    USING (SELECT @table_name AS table_name, @content_hash AS content_hash) S
+    ON T.table_name = S.table_name
+    WHEN MATCHED THEN UPDATE SET content_hash = S.content_hash, updated_at = CURRENT_TIMESTAMP()
+    WHEN NOT MATCHED THEN INSERT (table_name, content_hash, updated_at)
+        VALUES (S.table_name, S.content_hash, CURRENT_TIMESTAMP())
+    """
+    job_config = bigquery.QueryJobConfig(query_parameters=[
+        bigquery.ScalarQueryParameter("table_name", "STRING", cfg.latest_table),
+        bigquery.ScalarQueryParameter("content_hash", "STRING", content_hash),
+    ])
+    client.query(merge_query, job_config=job_config).result()
 
 
 def load_to_bigquery(cfg: Config, latest: pd.DataFrame, history: pd.DataFrame):
-    client = bigquery.Client(project=cfg.project_id)
+    client = get_client(cfg.project_id)
+    latest = categoricalize(latest)
+    history = categoricalize(history)
     job_config = bigquery.LoadJobConfig(write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE)
     print(f"Uploading latest snapshot → {cfg.latest_ref} ({len(latest)} rows)")
-    client.load_table_from_dataframe(latest, cfg.latest_ref, job_config=job_config).result()
     print(f"Uploading history → {cfg.history_ref} ({len(history)} rows)")
-    client.load_table_from_dataframe(history, cfg.history_ref, job_config=job_config).result()
+    # The two loads target different tables, so run them concurrently
+    # instead of waiting out two sequential network round-trips
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [
+            executor.submit(
+                lambda frame, ref: client.load_table_from_dataframe(frame, ref, job_config=job_config).result(),
+                frame,
+                ref,
+            )
+            for frame, ref in ((latest, cfg.latest_ref), (history, cfg.history_ref))
+        ]
+        for future in futures:
+            future.result()
     print("✅ Sync complete")
 
 
@@ -225,10 +321,22 @@ def main():
     args = parser.parse_args()
     cfg = Config(csv_path=Path(args.csv_path))
 
-    df, column_mapping = load_csv(cfg.csv_path)
-    history_df = build_history(df, column_mapping)
+    if not cfg.csv_path.exists():
+        raise FileNotFoundError(f"Source CSV not found: {cfg.csv_path}")
+
+    # Daily cron runs usually see an unchanged export: compare the
+    # file hash against the last synced one and skip all parse and
+    # upload work when nothing moved
+    content_hash = compute_csv_hash(cfg.csv_path)
+    if content_hash == get_last_synced_hash(cfg):
+        print("CSV unchanged since last sync — nothing to do")
+        return
+
+    df, column_mapping, parsed_dates = load_csv(cfg.csv_path)
+    history_df = build_history(df, column_mapping, parsed_dates)
     latest_df = build_latest(history_df)
     load_to_bigquery(cfg, latest_df, history_df)
+    store_synced_hash(cfg, content_hash)
 
 
 if __name__ == "__main__":